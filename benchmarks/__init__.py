@@ -0,0 +1,11 @@
+"""
+Benchmarks for flask-sillywalk. These are not part of the test suite, run
+them by hand. The suite times registration and spec serving on a synthetic
+registry and prints JSON, so runs can be compared:
+
+    $ python -m benchmarks --operations 5000 > before.json
+
+The other modules benchmark single features, e.g.:
+
+    $ python -m benchmarks.spec_cache
+"""
@@ -0,0 +1,30 @@
+"""
+Runs the benchmark suite and prints the results as JSON, e.g.:
+
+    $ python -m benchmarks --operations 5000 --resources 100 > after.json
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.suite import run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--operations", type=int, default=1000)
+    parser.add_argument("--resources", type=int, default=50)
+    parser.add_argument("--parameters", type=int, default=3)
+    parser.add_argument("--models", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", type=argparse.FileType("w"),
+                        default=sys.stdout)
+    args = parser.parse_args(argv)
+    output = args.output
+    del args.output
+    json.dump(run(**vars(args)), output, indent=2, sort_keys=True)
+    output.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""
+Times creating many apps from one registry, registered once and added to
+each app by init_app, against building a registry for every app.
+
+    $ python -m benchmarks.app_factory [apps] [operations]
+"""
+import sys
+import time
+
+from flask import Flask
+
+from benchmarks import synthetic
+from flask_sillywalk import SwaggerApiRegistry
+
+
+def main(apps=100, operations=200, models=20):
+    endpoints = list(synthetic.endpoints(operations))
+    classes = list(synthetic.model_classes(models))
+
+    def register(registry):
+        registry.add_register_many(endpoints)
+        for c in classes:
+            registry.registerModel()(c)
+
+    start = time.time()
+    for _ in range(apps):
+        app = Flask("synthetic")
+        register(SwaggerApiRegistry(app, baseurl=synthetic.BASEURL))
+        app.test_client().get("/api/v1/resources.json")
+    per_app = time.time() - start
+
+    start = time.time()
+    registry = SwaggerApiRegistry(baseurl=synthetic.BASEURL)
+    register(registry)
+    for _ in range(apps):
+        app = Flask("synthetic")
+        registry.init_app(app)
+        app.test_client().get("/api/v1/resources.json")
+    shared = time.time() - start
+
+    print("{0} apps, {1} operations, {2} models".format(
+        apps, operations, models))
+    print("{0:<32} {1:8.3f} s".format("registry per app", per_app))
+    print("{0:<32} {1:8.3f} s".format("one registry, init_app", shared))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
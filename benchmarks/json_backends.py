@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+"""
+Compares the installed JSON backends on the documents served by the spec
+endpoints.
+
+    $ python -m benchmarks.json_backends [operations]
+"""
+import sys
+import timeit
+
+from benchmarks import synthetic
+from flask_sillywalk.encoding import backends
+
+
+def main(operations=5000, number=20):
+    app, registry = synthetic.build(operations, models=100)
+    documents = [("resources.json", registry.resources()),
+                 ("res0.json", registry.show_resource("res0")())]
+    print("{0} operations in {1} resources".format(
+        operations, len(registry.r)))
+    for doc_name, document in documents:
+        for name, dumps in backends():
+            size = len(dumps(document))
+            elapsed = timeit.timeit(lambda: dumps(document),
+                                    number=number) / number
+            print("{0:<16} {1:<8} {2:10.1f} docs/s {3:8.1f} MB/s".format(
+                doc_name, name, 1 / elapsed, size / elapsed / 1e6))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
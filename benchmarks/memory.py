@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Measures the memory held per operation by the registry's Api objects,
+against the 2.1 layout: a __dict__ on every Api, ApiParameter and
+ApiErrorResponse, and no sharing of identical definitions.
+
+    $ python -m benchmarks.memory [operations]
+"""
+import sys
+import tracemalloc
+
+from flask_sillywalk import SwaggerApiRegistry, ApiParameter, ApiErrorResponse
+from flask_sillywalk.sillywalk import Api
+
+
+class LegacyApi(object):
+
+    def __init__(self, method, path, httpMethod, params=None,
+                 responseMessages=None, nickname=None, notes=None):
+        self.httpMethod = httpMethod
+        self.summary = method.__doc__ if method.__doc__ is not None else ""
+        self.resource = path.lstrip("/").split("/")[0]
+        self.path = path.replace("<", "{").replace(">", "}")
+        self.parameters = [] if params is None else params
+        self.responseMessages = [] if responseMessages is None else responseMessages
+        self.nickname = "" if nickname is None else nickname
+        self.notes = notes
+
+
+class LegacyApiParameter(object):
+
+    def __init__(self, name, description, required, dataType, paramType,
+                 allowMultiple=False):
+        self.name = name
+        self.description = description
+        self.required = required
+        self.dataType = dataType
+        self.paramType = paramType
+        self.allowMultiple = allowMultiple
+
+
+class LegacyApiErrorResponse(object):
+
+    def __init__(self, code, message):
+        self.message = message
+        self.code = code
+
+
+def view(id):
+    """Fetches a thing."""
+    return id
+
+
+def operations(count, api, parameter, error, intern=lambda x: x):
+    apis = []
+    for i in range(count):
+        apis.append(api(
+            view,
+            "/res{0}/op{1}/<id>".format(i % 50, i),
+            "GET",
+            params=[intern(parameter("id", "The id", True, "int", "path")),
+                    intern(parameter("page", "Page number", False, "int",
+                                     "query")),
+                    intern(parameter("per_page", "Page size", False, "int",
+                                     "query"))],
+            responseMessages=[intern(error(401, "Unauthorized")),
+                              intern(error(404, "Not found"))]))
+        # documenting the 2.1 objects materializes their instance dicts
+        for obj in [apis[-1]] + apis[-1].parameters + apis[-1].responseMessages:
+            getattr(obj, "__dict__", None)
+    return apis
+
+
+def measure(count, *args):
+    tracemalloc.start()
+    apis = operations(count, *args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del apis
+    return size
+
+
+def main(count=10000):
+    registry = SwaggerApiRegistry(baseurl="http://localhost/api/v1")
+    before = measure(count, LegacyApi, LegacyApiParameter,
+                     LegacyApiErrorResponse)
+    after = measure(count, Api, ApiParameter, ApiErrorResponse,
+                    registry._intern)
+    print("{0} operations, 3 parameters and 2 error responses each".format(
+        count))
+    print("{0:<28} {1:8.0f} bytes/op".format("dicts, no interning",
+                                             before / float(count)))
+    print("{0:<28} {1:8.0f} bytes/op".format("slots, interned",
+                                             after / float(count)))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""
+Times decorating model classes with registerModel, which only records them,
+against building their schemas, which now waits for the first spec request.
+
+    $ python -m benchmarks.models [models]
+"""
+import sys
+import time
+
+from benchmarks import synthetic
+from flask_sillywalk.sillywalk import model_schema
+
+
+def main(count=5000):
+    classes = list(synthetic.model_classes(count))
+    registry = synthetic.build(0)[1]
+
+    start = time.time()
+    for c in classes:
+        registry.registerModel()(c)
+    decorated = time.time() - start
+
+    start = time.time()
+    for c in classes:
+        model_schema(c)
+    eager = time.time() - start
+
+    start = time.time()
+    registry.resources()
+    first_request = time.time() - start
+
+    print("{0} models".format(count))
+    print("{0:<32} {1:8.3f} s".format("registerModel (lazy)", decorated))
+    print("{0:<32} {1:8.3f} s".format("eager introspection", eager))
+    print("{0:<32} {1:8.3f} s".format("first resources() call", first_request))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
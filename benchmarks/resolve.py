@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Times registry.resolve on registries of growing size, against scanning
+registry.r and matching every (precompiled) path template in turn.
+
+    $ python -m benchmarks.resolve [operations...]
+"""
+import re
+import sys
+import timeit
+
+from benchmarks import synthetic
+
+
+def compile_templates(registry):
+    """
+    Returns a (regex, apis) pair per path template, compiled up front.
+    """
+    return [(re.compile("^" + re.sub(r"\{[^}]*\}", "[^/]+", template) + "$"),
+             apis)
+            for resource_map in registry.r.values()
+            for template, apis in resource_map.items()]
+
+
+def scan(templates, method, path):
+    for pattern, apis in templates:
+        if pattern.match(path):
+            for api in apis:
+                if api.httpMethod == method:
+                    return api
+    return None
+
+
+def main(*sizes):
+    sizes = sizes or (100, 1000, 10000)
+    for operations in sizes:
+        registry = synthetic.build(operations)[1]
+        # the last operation registered, the worst case for a scan
+        i = operations - 1
+        method = synthetic.METHODS[i % len(synthetic.METHODS)]
+        path = "/api/v1/res{0}/path{1}/42".format(i % 50, i // 4)
+        templates = compile_templates(registry)
+        assert registry.resolve(method, path)[0] is scan(
+            templates, method, path[len("/api/v1"):])
+        number = 20000
+        resolved = min(timeit.repeat(
+            lambda: registry.resolve(method, path), number=number,
+            repeat=5)) / number
+        scanned = min(timeit.repeat(
+            lambda: scan(templates, method, path[len("/api/v1"):]),
+            number=10, repeat=3)) / 10
+        print("{0:>6} operations  resolve {1:7.2f} us  scan {2:10.1f} us"
+              .format(operations, resolved * 1e6, scanned * 1e6))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Times turning a large list of model instances into JSON-ready rows with the
+compiled serializer of a registered model, against walking each instance's
+vars().
+
+    $ python -m benchmarks.serializers [instances]
+"""
+import sys
+import timeit
+
+from benchmarks import synthetic
+from flask_sillywalk.encoding import find_dumps
+
+
+class Cheese(object):
+    """A cheese from the shop."""
+
+    def __init__(self, name, country, milk, aged_days, price, smelly=True,
+                 runny=False, in_stock=False):
+        self.name = name
+        self.country = country
+        self.milk = milk
+        self.aged_days = aged_days
+        self.price = price
+        self.smelly = smelly
+        self.runny = runny
+        self.in_stock = in_stock
+        self._shelf = None
+
+
+def naive(objs):
+    return [dict((k, v) for k, v in vars(obj).items()
+                 if not k.startswith("_")) for obj in objs]
+
+
+def naive_copy(objs):
+    return [dict(vars(obj)) for obj in objs]
+
+
+def main(count=10000, number=20):
+    registry = synthetic.build(0)[1]
+    registry.registerModel()(Cheese)
+    serializer = registry.serializer(Cheese)
+    cheeses = [Cheese("cheese{0}".format(i), "UK", "cow", i % 365, i * 0.01)
+               for i in range(count)]
+    dumps = find_dumps()
+    assert serializer.serialize_many(cheeses) == naive(cheeses)
+
+    print("{0} instances".format(count))
+    for name, f in [
+            ("vars(), filtered", naive),
+            ("dict(vars(obj))", naive_copy),
+            ("serializer per instance",
+             lambda objs: [serializer(obj) for obj in objs]),
+            ("serializer.serialize_many", serializer.serialize_many)]:
+        rows = timeit.timeit(lambda: f(cheeses), number=number) / number
+        encoded = timeit.timeit(lambda: dumps(f(cheeses)),
+                                number=number) / number
+        print("{0:<28} {1:8.2f} ms rows {2:8.2f} ms JSON".format(
+            name, rows * 1e3, encoded * 1e3))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+"""
+Compares spec documents with parameters and response messages inlined in
+every operation against shared definitions referred to by $ref.
+
+    $ python -m benchmarks.shared_definitions [operations]
+"""
+import gzip
+import sys
+import timeit
+
+from benchmarks import synthetic
+
+
+def main(operations=10000, number=10):
+    print("{0} operations".format(operations))
+    for shared in (False, True):
+        app, registry = synthetic.build(operations,
+                                        shared_definitions=shared)
+        for name, build in [("spec.json", registry.spec),
+                            ("res0.json", registry.show_resource("res0"))]:
+            body = registry.dumps(build())
+            built = min(timeit.repeat(build, number=1, repeat=number))
+            encoded = min(timeit.repeat(lambda: registry.dumps(build()),
+                                        number=1, repeat=number))
+            print("{0:<8} {1:<10} {2:10d} B {3:9d} B gzip "
+                  "{4:8.1f} ms build {5:8.1f} ms build+encode".format(
+                      "shared" if shared else "inline", name, len(body),
+                      len(gzip.compress(body)), built * 1e3, encoded * 1e3))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
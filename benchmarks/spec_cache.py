@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+"""
+Compares serving spec documents with and without the encoded document cache.
+
+    $ python -m benchmarks.spec_cache [operations]
+"""
+import sys
+import timeit
+
+from benchmarks import synthetic
+
+
+def main(operations=5000, number=20):
+    app, registry = synthetic.build(operations)
+    key = ("resource", "res0")
+    uncached = registry.jsonify(registry.show_resource("res0"))
+    cached = registry.jsonify(registry.show_resource("res0"), key=key)
+    index_uncached = registry.jsonify(registry.resources)
+    index_cached = registry.jsonify(registry.resources, key=("resources",))
+
+    print("{0} operations in {1} resources, {2} calls each".format(
+        operations, len(registry.r), number))
+    with app.test_request_context():
+        for name, f in [("resource doc, uncached", uncached),
+                        ("resource doc, cached", cached),
+                        ("resources.json, uncached", index_uncached),
+                        ("resources.json, cached", index_cached)]:
+            f()  # warm up
+            elapsed = timeit.timeit(f, number=number)
+            print("{0:<26} {1:10.1f} us/call".format(
+                name, elapsed / number * 1e6))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
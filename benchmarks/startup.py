@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+"""
+Times registering endpoints one by one and in bulk.
+
+    $ python -m benchmarks.startup [operations ...]
+"""
+import sys
+import time
+
+from benchmarks import synthetic
+
+
+def one_by_one(registry, specs):
+    for spec in specs:
+        registry.add_register(**spec)
+
+
+def in_bulk(registry, specs):
+    registry.add_register_many(specs)
+
+
+def main(*sizes):
+    for operations in sizes or (1000, 10000, 50000):
+        # spread out, and all in a single resource
+        for resources in (200, 1):
+            for name, register in [("add_register", one_by_one),
+                                   ("add_register_many", in_bulk)]:
+                specs = list(synthetic.endpoints(operations,
+                                                 resources=resources))
+                registry = synthetic.build(0)[1]
+                start = time.time()
+                register(registry, specs)
+                elapsed = time.time() - start
+                print("{0:>6} operations {1:>3} resources {2:<18} {3:8.3f} s "
+                      "{4:8.1f} us/op".format(operations, resources, name,
+                                              elapsed,
+                                              elapsed / operations * 1e6))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
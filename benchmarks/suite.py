@@ -0,0 +1,94 @@
+"""
+Times registration and spec serving on a synthetic registry and reports
+the results as JSON.
+"""
+import platform
+import timeit
+
+import flask
+
+from benchmarks import synthetic
+
+
+def _time(f, repeat, number=1, setup=None):
+    """
+    Runs ``f`` ``number`` times per round for ``repeat`` rounds and returns
+    per-call timings in seconds. ``setup`` runs before every round and its
+    result is passed to ``f``.
+    """
+    runs = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        call = (lambda: f(arg)) if setup is not None else f
+        runs.append(timeit.timeit(call, number=number) / number)
+    runs.sort()
+    return {"min": runs[0], "median": runs[len(runs) // 2],
+            "max": runs[-1], "rounds": repeat, "number": number}
+
+
+def run(operations=1000, resources=50, parameters=3, models=100, repeat=5):
+    config = {"operations": operations, "resources": resources,
+              "parameters": parameters, "models": models, "repeat": repeat}
+    results = {}
+
+    def fresh_registry():
+        return synthetic.build(0, resources, parameters)[1]
+
+    def specs():
+        return fresh_registry(), list(synthetic.endpoints(
+            operations, resources, parameters))
+
+    def add_register(arg):
+        registry, endpoints = arg
+        for endpoint in endpoints:
+            registry.add_register(**endpoint)
+
+    def register(arg):
+        registry, endpoints = arg
+        for endpoint in endpoints:
+            kwargs = dict(endpoint)
+            registry.register(kwargs.pop("path"), **dict(
+                (k, v) for k, v in kwargs.items() if k != "f"))(endpoint["f"])
+
+    def add_register_many(arg):
+        registry, endpoints = arg
+        registry.add_register_many(endpoints)
+
+    for name, f in [("add_register", add_register), ("register", register),
+                    ("add_register_many", add_register_many)]:
+        results[name] = _time(f, repeat, setup=specs)
+        results[name]["per_operation"] = results[name]["median"] / operations
+
+    def classes():
+        return fresh_registry(), list(synthetic.model_classes(models))
+
+    def register_models(arg):
+        registry, classes = arg
+        for c in classes:
+            registry.registerModel()(c)
+        registry._resolve_models()
+
+    results["registerModel"] = _time(register_models, repeat, setup=classes)
+
+    app, registry = synthetic.build(operations, resources, parameters, models)
+    registry.resources()
+    show_resource = registry.show_resource("res0")
+    results["resources"] = _time(registry.resources, repeat, 10)
+    results["show_resource"] = _time(show_resource, repeat, 10)
+
+    client = app.test_client()
+    for name, url, headers in [
+            ("GET resources.json", "/api/v1/resources.json", {}),
+            ("GET res0.json", "/api/v1/res0.json", {}),
+            ("GET res0.json gzip", "/api/v1/res0.json",
+             {"Accept-Encoding": "gzip"})]:
+        client.get(url, headers=headers)
+        results[name] = _time(lambda: client.get(url, headers=headers),
+                              repeat, 10)
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "flask": getattr(flask, "__version__", None),
+        "config": config,
+        "results": results}
@@ -0,0 +1,72 @@
+"""
+Synthetic registries of configurable size.
+"""
+from flask import Flask
+from flask_sillywalk import SwaggerApiRegistry, ApiParameter, ApiErrorResponse
+
+
+BASEURL = "http://localhost/api/v1"
+METHODS = ["GET", "POST", "PUT", "DELETE"]
+
+
+def make_view(i):
+    def view(**kwargs):
+        """Does synthetic things."""
+        return "OK"
+    view.__name__ = "view_{0}".format(i)
+    return view
+
+
+def endpoints(operations, resources=50, parameters=3):
+    """
+    Yields add_register keyword arguments for ``operations`` operations
+    spread over ``resources`` resources. Operations come in groups of four
+    methods on the same path, each with one path parameter and
+    ``parameters - 1`` query parameters, shared across operations.
+    """
+    for i in range(operations):
+        path = "/api/v1/res{0}/path{1}/<id>".format(i % resources, i // 4)
+        params = [ApiParameter("id", "The id", True, "int", "path")]
+        params.extend(
+            ApiParameter("q{0}".format(j), "Query parameter {0}".format(j),
+                         False, "str", "query")
+            for j in range(parameters - 1))
+        yield {
+            "path": path,
+            "f": make_view(i),
+            "method": METHODS[i % len(METHODS)],
+            "parameters": params,
+            "responseMessages": [ApiErrorResponse(401, "Unauthorized"),
+                                 ApiErrorResponse(404, "Not found")],
+            "notes": "Synthetic operation {0}.".format(i)}
+
+
+def model_classes(models, fields=5):
+    """
+    Yields ``models`` classes whose constructors take ``fields`` arguments,
+    the last half of them with defaults.
+    """
+    required = ["f{0}".format(j) for j in range(fields - fields // 2)]
+    optional = ["f{0}=None".format(j)
+                for j in range(len(required), fields)]
+    source = "def __init__(self, {0}):\n    pass\n".format(
+        ", ".join(required + optional))
+    namespace = {}
+    exec(source, namespace)
+    for i in range(models):
+        yield type("Model{0}".format(i), (object,), {
+            "__doc__": "Synthetic model {0}.".format(i),
+            "__init__": namespace["__init__"]})
+
+
+def build(operations=1000, resources=50, parameters=3, models=0, **kwargs):
+    """
+    Returns a Flask app and a registry filled with synthetic operations and
+    models. Extra keyword arguments go to SwaggerApiRegistry.
+    """
+    app = Flask("synthetic")
+    registry = SwaggerApiRegistry(app, baseurl=BASEURL, **kwargs)
+    registry.add_register_many(endpoints(operations, resources, parameters))
+    for c in model_classes(models):
+        registry.registerModel()(c)
+    return app, registry
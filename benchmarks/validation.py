@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Times validating one request with the validator compiled from an
+operation's parameters, against a generic one interpreting the parameter
+list on every request.
+
+    $ python -m benchmarks.validation [number]
+"""
+import sys
+import timeit
+
+from flask import Flask, request
+
+from flask_sillywalk import ApiParameter
+from flask_sillywalk.validation import (COERCERS, ValidationError,
+                                        compile_validator)
+
+
+PARAMETERS = [
+    ApiParameter("id", "The id", True, "int", "path"),
+    ApiParameter("page", "The page", False, "int", "query"),
+    ApiParameter("size", "Page size", False, "int", "query"),
+    ApiParameter("sort", "Sort key", False, "str", "query"),
+    ApiParameter("fresh", "Only fresh", False, "boolean", "query"),
+    ApiParameter("tags", "Tags", False, "str", "query", allowMultiple=True),
+    ApiParameter("X-Request-Id", "Request id", True, "str", "header")]
+
+
+def interpreted(parameters, kwargs, request):
+    errors = []
+    for param in parameters:
+        if param.paramType == "path":
+            value = kwargs.get(param.name)
+        elif param.paramType == "query":
+            if param.allowMultiple:
+                value = request.args.getlist(param.name) or None
+            else:
+                value = request.args.get(param.name)
+        elif param.paramType == "header":
+            value = request.headers.get(param.name)
+        else:
+            continue
+        if value is None:
+            if param.required:
+                errors.append({"name": param.name, "error": "missing"})
+            continue
+        coerce = COERCERS.get(param.dataType)
+        try:
+            if coerce is None:
+                pass
+            elif param.allowMultiple:
+                value = [coerce(v) for v in value]
+            else:
+                value = coerce(value)
+        except (TypeError, ValueError):
+            errors.append({"name": param.name, "error": "invalid"})
+            continue
+        kwargs[param.name] = value
+    if errors:
+        raise ValidationError(errors)
+    return kwargs
+
+
+def main(number=100000):
+    app = Flask("synthetic")
+    compiled = compile_validator(PARAMETERS)
+    url = "/api/v1/res/42?page=3&size=50&sort=name&fresh=true&tags=a&tags=b"
+    with app.test_request_context(url, headers={"X-Request-Id": "abc"}):
+        # parse the query string and headers up front, both validators
+        # share that cost
+        request.args, request.headers
+        assert (compiled({"id": "42"}, request) ==
+                interpreted(PARAMETERS, {"id": "42"}, request))
+        for name, f in [
+                ("compiled", lambda: compiled({"id": "42"}, request)),
+                ("interpreted",
+                 lambda: interpreted(PARAMETERS, {"id": "42"}, request))]:
+            elapsed = min(timeit.repeat(f, number=number, repeat=5))
+            print("{0:<12} {1:8.2f} us/request".format(
+                name, elapsed / number * 1e6))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,46 @@
+"""
+Command line interface.
+
+    $ python -m flask_sillywalk export myapp:app outdir/
+"""
+import argparse
+import importlib
+import os
+import sys
+
+from flask_sillywalk.export import export, find_registry
+
+
+def load(name):
+    """
+    Imports ``module:attribute``, the attribute defaults to ``app``.
+    """
+    module, _, attr = name.partition(":")
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    return getattr(importlib.import_module(module), attr or "app")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m flask_sillywalk")
+    commands = parser.add_subparsers(dest="command")
+    export_parser = commands.add_parser(
+        "export", help="write the spec documents to static files")
+    export_parser.add_argument(
+        "app", help="the Flask app or registry, as module:attribute")
+    export_parser.add_argument("outdir", help="the directory to write to")
+    export_parser.add_argument(
+        "--no-gzip", dest="compress", action="store_false",
+        help="don't write precompressed .gz files")
+    args = parser.parse_args(argv)
+    if args.command != "export":
+        parser.print_help()
+        return 2
+    for path in export(find_registry(load(args.app)), args.outdir,
+                       args.compress):
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
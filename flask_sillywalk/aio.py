@@ -0,0 +1,165 @@
+"""
+View wrappers for ``async def`` views. Flask only awaits a view if the routed
+function is a coroutine function itself, so wrapping one must give another.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+
+import flask
+
+from flask_sillywalk.caching import (ResponseCache, key_function, store,
+                                     thaw, vary_headers)
+from flask_sillywalk.encoding import encode_return
+from flask_sillywalk.limits import overloaded
+from flask_sillywalk.metrics import is_error, raised_error, timer
+from flask_sillywalk.validation import (ValidationError, accepted,
+                                        bad_request, compile_validator)
+
+
+def is_async(f):
+    """
+    Whether the view ``f`` is a coroutine function.
+    """
+    return inspect.iscoroutinefunction(f)
+
+
+def encode_view(f, dumps):
+    """
+    Like encoding.encode_view, for a coroutine view.
+    """
+
+    @functools.wraps(f)
+    async def inner_func(*args, **kwargs):
+        return encode_return(await f(*args, **kwargs), dumps)
+
+    return inner_func
+
+
+def instrument(f, metrics):
+    """
+    Like metrics.instrument, for a coroutine view. The latency recorded
+    includes the time spent awaiting.
+    """
+
+    @functools.wraps(f)
+    async def inner_func(*args, **kwargs):
+        start = timer()
+        error = True
+        try:
+            rv = await f(*args, **kwargs)
+            error = is_error(rv)
+            return rv
+        except BaseException as e:
+            error = raised_error(e)
+            raise
+        finally:
+            metrics.record(timer() - start, error)
+
+    return inner_func
+
+
+def validate_view(f, parameters, responseMessages, dumps):
+    """
+    Like validation.validate_view, for a coroutine view.
+    """
+    validate = compile_validator(parameters, accepted(f))
+
+    @functools.wraps(f)
+    async def inner_func(*args, **kwargs):
+        try:
+            kwargs = validate(kwargs, flask.request)
+        except ValidationError as e:
+            return bad_request(e.errors, responseMessages, dumps)
+        return await f(*args, **kwargs)
+
+    return inner_func
+
+
+def cache_view(f, policy, parameters):
+    """
+    Like caching.cache_view, for a coroutine view. Waiting for a response
+    another request is computing doesn't block the event loop.
+    """
+    cache = ResponseCache(policy.ttl, policy.maxEntries)
+    key_of = key_function(parameters, policy.vary)
+    vary = vary_headers(parameters, policy.vary)
+
+    @functools.wraps(f)
+    async def inner_func(*args, **kwargs):
+        key = key_of(kwargs, flask.request)
+        while True:
+            frozen, pending = cache.get(key)
+            if frozen is not None:
+                return thaw(frozen, vary)
+            if pending is None:
+                break
+            done = await asyncio.get_running_loop().run_in_executor(
+                None, pending.done.wait, cache.wait_timeout)
+            if not done:
+                # don't hang on a request that's stuck, go without the cache
+                return await f(*args, **kwargs)
+        try:
+            return store(cache, key, await f(*args, **kwargs), vary)
+        except BaseException:
+            cache.release(key)
+            raise
+
+    inner_func.cache = cache
+    return inner_func
+
+
+async def wait_for_slot(limit):
+    """
+    Waits for a slot of ``limit`` in a worker thread. The thread goes on
+    waiting if the request is cancelled meanwhile, e.g. when the client goes
+    away; a slot it still gets is then given back instead of lost.
+    """
+    lock = threading.Lock()
+    cancelled = False
+    handed_over = False
+
+    def wait():
+        nonlocal handed_over
+        acquired = limit.wait()
+        with lock:
+            if cancelled:
+                if acquired:
+                    limit.release()
+                return False
+            handed_over = acquired
+        return acquired
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, wait)
+    except asyncio.CancelledError:
+        with lock:
+            cancelled = True
+            # taken, but cancelled before the result got here
+            if handed_over:
+                limit.release()
+        raise
+
+
+def limit_view(f, limit, message, dumps):
+    """
+    Like limits.limit_view, for a coroutine view. Waiting for a slot
+    doesn't block the event loop.
+    """
+
+    @functools.wraps(f)
+    async def inner_func(*args, **kwargs):
+        if not limit.try_acquire():
+            acquired = False
+            if limit.queue_timeout:
+                acquired = await wait_for_slot(limit)
+            if not acquired:
+                limit.reject()
+                return overloaded(message, dumps)
+        try:
+            return await f(*args, **kwargs)
+        finally:
+            limit.release()
+
+    return inner_func
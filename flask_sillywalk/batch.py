@@ -0,0 +1,203 @@
+"""
+The batch endpoint: many documented operations in one request. Each
+sub-request is resolved to its operation, validated against its declared
+parameters and dispatched in-process. Consecutive safe sub-requests run in
+parallel; unsafe ones run on their own, in order.
+"""
+import base64
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import flask
+from werkzeug.test import EnvironBuilder
+
+from flask_sillywalk.validation import (ValidationError, bad_request,
+                                        compile_validator)
+
+
+SAFE_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+# headers of the batch request that don't apply to its sub-requests
+NOT_FORWARDED = frozenset(["content-length", "content-type", "host"])
+
+
+def parse(items, max_items):
+    """
+    Returns the (method, path, params, headers, body) of each sub-request,
+    or raises ValueError.
+    """
+    if not isinstance(items, list):
+        raise ValueError("Expected a list of sub-requests")
+    if len(items) > max_items:
+        raise ValueError("At most {0} sub-requests per batch".format(
+            max_items))
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(
+                item.get("path"), str):
+            raise ValueError("Each sub-request needs a path")
+        if "?" in item["path"] or "#" in item["path"]:
+            raise ValueError("Query parameters of a sub-request go in its "
+                             "params")
+        params = item.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError("params must be an object")
+        headers = item.get("headers") or {}
+        if not isinstance(headers, dict) or not all(
+                isinstance(v, str) for v in headers.values()):
+            raise ValueError("headers must be an object of strings")
+        parsed.append((
+            str(item.get("method", "GET")).upper(),
+            item["path"],
+            params,
+            headers,
+            item.get("body")))
+    return parsed
+
+
+def groups(requests):
+    """
+    Splits sub-requests into the groups that may run at the same time:
+    runs of safe ones, and each unsafe one on its own.
+    """
+    group = []
+    for i, request in enumerate(requests):
+        if request[0] in SAFE_METHODS:
+            group.append(i)
+            continue
+        if group:
+            yield group
+            group = []
+        yield [i]
+    if group:
+        yield group
+
+
+class BatchRunner(object):
+    """
+    Runs the sub-requests of batches on a pool of ``workers`` threads,
+    shared by all batches.
+    """
+
+    def __init__(self, registry, workers=8, max_items=50):
+        self.registry = registry
+        self.workers = workers
+        self.max_items = max_items
+        self._executor = None
+        self._validators = {}
+        self._lock = threading.Lock()
+
+    def executor(self):
+        # started on first use, e.g. in workers after a fork
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.workers)
+        return self._executor
+
+    def view(self):
+        """
+        Serves a batch: a JSON list of {method, path, params, headers,
+        body} sub-requests. Answers with a list of {status, body}, in the
+        same order.
+        """
+        dumps = self.registry.dumps
+        try:
+            requests = parse(flask.request.get_json(force=True, silent=True),
+                             self.max_items)
+        except ValueError as e:
+            return flask.Response(
+                response=dumps({"code": 400, "message": str(e)}),
+                status=400,
+                mimetype="application/json")
+        app = flask.current_app._get_current_object()
+        outer = flask.request
+        forwarded = [(k, v) for k, v in outer.headers.items()
+                     if k.lower() not in NOT_FORWARDED]
+        base = (outer.url_root, outer.remote_addr, forwarded)
+        results = [None] * len(requests)
+        for group in groups(requests):
+            if len(group) == 1:
+                results[group[0]] = self.run(app, requests[group[0]], base)
+                continue
+            futures = [(i, self.executor().submit(
+                self.run, app, requests[i], base)) for i in group]
+            for i, future in futures:
+                results[i] = future.result()
+        return flask.Response(response=dumps(results),
+                              status=200,
+                              mimetype="application/json")
+
+    def run(self, app, request, base):
+        """
+        Resolves, validates and dispatches one sub-request, and returns its
+        result.
+        """
+        method, path, params, headers, body = request
+        url_root, remote_addr, forwarded = base
+        found = self.registry.resolve(method, path)
+        if found is None:
+            return {"status": 404, "body": {
+                "code": 404, "message": "No such operation"}}
+        api, path_params = found
+        basepath = self.registry.basepath.rstrip("/")
+        if not (path == basepath or path.startswith(basepath + "/")):
+            path = basepath + "/" + path.lstrip("/")
+        # whatever goes wrong, only this sub-request fails
+        try:
+            builder = EnvironBuilder(
+                path=path,
+                base_url=url_root,
+                method=method,
+                query_string=params,
+                headers=forwarded + list(headers.items()),
+                data=None if body is None else json.dumps(body),
+                content_type=None if body is None else "application/json",
+                environ_base={"REMOTE_ADDR": remote_addr})
+            try:
+                environ = builder.get_environ()
+            finally:
+                builder.close()
+            with app.request_context(environ):
+                try:
+                    self._validator(api)(path_params, flask.request)
+                except ValidationError as e:
+                    response = bad_request(e.errors, api.responseMessages,
+                                           self.registry.dumps)
+                else:
+                    response = app.full_dispatch_request()
+            return _result(response)
+        except Exception:
+            app.log_exception(sys.exc_info())
+            return {"status": 500, "body": {
+                "code": 500, "message": "Internal Server Error"}}
+
+    def _validator(self, api):
+        validate = self._validators.get(api)
+        if validate is None:
+            validate = compile_validator(api.parameters)
+            self._validators[api] = validate
+        return validate
+
+
+def _result(response):
+    """
+    Returns the {status, body} of a sub-request's response. JSON bodies
+    are embedded as they are, other text as a string, and bodies that
+    aren't UTF-8 text base64-encoded, flagged with "encoding".
+    """
+    data = response.get_data()
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return {"status": response.status_code,
+                "body": base64.b64encode(data).decode("ascii"),
+                "encoding": "base64"}
+    if response.mimetype == "application/json":
+        try:
+            return {"status": response.status_code, "body": json.loads(text)}
+        except ValueError:
+            pass
+    return {"status": response.status_code, "body": text}
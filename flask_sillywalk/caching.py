@@ -0,0 +1,168 @@
+"""
+Response caching for GET operations, as declared by their ApiCachePolicy.
+Responses are kept in a bounded LRU with a TTL, keyed by the declared
+parameters only.
+"""
+import functools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import flask
+
+# seconds a request waits for the response another one is computing, before
+# computing its own without the cache
+WAIT_TIMEOUT = 10.0
+
+
+class _Pending(object):
+    """
+    A response being computed, the requests wanting it too wait for it.
+    """
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class ResponseCache(object):
+    """
+    The cached responses of one operation, at most ``max_entries`` of them
+    for ``ttl`` seconds each.
+    """
+
+    def __init__(self, ttl, max_entries, clock=time.monotonic,
+                 wait_timeout=WAIT_TIMEOUT):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.wait_timeout = wait_timeout
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the cached value for ``key`` or None. On a miss, returns
+        the _Pending to wait for if another request is computing it, or
+        claims the key: the caller must then put or release it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    return entry[1], None
+                del self._entries[key]
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = _Pending()
+            return None, pending
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self.release(key)
+
+    def release(self, key):
+        with self._lock:
+            pending = self._pending.pop(key, None)
+        if pending is not None:
+            pending.done.set()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def vary_headers(parameters, vary=()):
+    """
+    The request headers a cached response depends on: the declared header
+    parameters, then the ``vary`` headers.
+    """
+    headers = tuple(p.name for p in parameters if p.paramType == "header")
+    return headers + tuple(h for h in vary if h not in headers)
+
+
+def key_function(parameters, vary=()):
+    """
+    Returns a function building the cache key of a request from the path
+    arguments of the view and the declared query and header parameters,
+    plus the ``vary`` headers. Apps sharing a registry don't share
+    responses: the key starts with a weak reference to the app, which never
+    equals one to another app, even one reusing the id of a collected app.
+    """
+    path = tuple(p.name for p in parameters if p.paramType == "path")
+    query = tuple(p.name for p in parameters if p.paramType == "query")
+    headers = vary_headers(parameters, vary)
+
+    def key(kwargs, request):
+        args = request.args
+        return ((weakref.ref(flask.current_app._get_current_object()),) +
+                tuple(kwargs.get(name) for name in path) +
+                tuple(tuple(args.getlist(name)) for name in query) +
+                tuple(request.headers.get(name) for name in headers))
+
+    return key
+
+
+def store(cache, key, rv, vary):
+    """
+    Caches the response ``rv`` computed for the claimed ``key``, if it's a
+    200 with its body in memory, and returns the response to send.
+    """
+    response = flask.current_app.make_response(rv)
+    if response.status_code != 200 or response.is_streamed:
+        cache.release(key)
+        return response
+    frozen = (response.get_data(), response.status, list(response.headers))
+    cache.put(key, frozen)
+    return thaw(frozen, vary)
+
+
+def thaw(frozen, vary):
+    """
+    Returns a new response from a cached one, responses aren't shared
+    since after_request handlers may change them.
+    """
+    body, status, headers = frozen
+    response = flask.Response(body, status=status, headers=headers)
+    for header in vary:
+        response.vary.add(header)
+    return response
+
+
+def cache_view(f, policy, parameters):
+    """
+    Wraps the view ``f`` so its responses are cached as ``policy`` says.
+    Concurrent misses for the same key call ``f`` once, the others wait for
+    its response, up to the cache's wait_timeout.
+    """
+    cache = ResponseCache(policy.ttl, policy.maxEntries)
+    key_of = key_function(parameters, policy.vary)
+    vary = vary_headers(parameters, policy.vary)
+
+    @functools.wraps(f)
+    def inner_func(*args, **kwargs):
+        key = key_of(kwargs, flask.request)
+        while True:
+            frozen, pending = cache.get(key)
+            if frozen is not None:
+                return thaw(frozen, vary)
+            if pending is None:
+                break
+            if not pending.done.wait(cache.wait_timeout):
+                # don't hang on a request that's stuck, go without the cache
+                return f(*args, **kwargs)
+        try:
+            return store(cache, key, f(*args, **kwargs), vary)
+        except BaseException:
+            # e.g. a view returning None, the waiting requests mustn't hang
+            cache.release(key)
+            raise
+
+    inner_func.cache = cache
+    return inner_func
@@ -0,0 +1,40 @@
+"""
+An ordered log of registry changes, so clients can catch up on what was
+registered since the spec they have.
+"""
+import bisect
+
+
+class ChangeLog(object):
+    """
+    Changes stamped with the registry version that made them, oldest first.
+    Only the most recent ``size`` or so are kept. Writers append while
+    holding the registry lock; readers never lock.
+    """
+
+    def __init__(self, size=10000):
+        self.size = size
+        # every change after the version ``floor`` is in ``entries``; both
+        # are swapped together so readers always see a matching pair
+        self._state = (0, [])
+
+    def append(self, version, changes):
+        """
+        Records ``changes``, (kind, value) pairs, as made by ``version``.
+        """
+        floor, entries = self._state
+        for kind, value in changes:
+            entries.append((version, kind, value))
+        if len(entries) > 2 * self.size:
+            dropped = len(entries) - self.size
+            self._state = (entries[dropped - 1][0], entries[dropped:])
+
+    def since(self, version):
+        """
+        Returns the (version, kind, value) entries made after ``version``,
+        or None if some of them are no longer kept.
+        """
+        floor, entries = self._state
+        if version < floor:
+            return None
+        return entries[bisect.bisect_left(entries, (version + 1,)):]
@@ -0,0 +1,79 @@
+"""
+JSON backends. Each backend is a function encoding an object to UTF-8 JSON
+bytes; the fastest one installed is used by default.
+"""
+import functools
+import json
+
+import flask
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj).encode("utf-8")
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+else:
+    def orjson_dumps(obj):
+        return orjson.dumps(obj)
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+else:
+    def ujson_dumps(obj):
+        return ujson.dumps(obj, escape_forward_slashes=False).encode("utf-8")
+
+
+def backends():
+    """
+    Returns the installed backends by name, fastest first.
+    """
+    found = []
+    if orjson is not None:
+        found.append(("orjson", orjson_dumps))
+    if ujson is not None:
+        found.append(("ujson", ujson_dumps))
+    found.append(("json", stdlib_dumps))
+    return found
+
+
+def find_dumps():
+    """
+    Returns the fastest installed backend.
+    """
+    return backends()[0][1]
+
+
+def encode_view(f, dumps):
+    """
+    Wraps the view ``f`` so that returning a dict or a list, alone or as the
+    first item of a (body, status[, headers]) tuple, sends it as JSON
+    encoded with ``dumps``. Anything else is passed through.
+    """
+
+    @functools.wraps(f)
+    def inner_func(*args, **kwargs):
+        return encode_return(f(*args, **kwargs), dumps)
+
+    return inner_func
+
+
+def encode_return(rv, dumps):
+    """
+    Encodes a view's return value the way encode_view does.
+    """
+
+    def response(rv):
+        return flask.Response(response=dumps(rv),
+                mimetype="application/json")
+
+    if isinstance(rv, (dict, list)):
+        return response(rv)
+    if isinstance(rv, tuple) and rv and isinstance(rv[0], (dict, list)):
+        return (response(rv[0]),) + rv[1:]
+    return rv
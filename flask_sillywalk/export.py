@@ -0,0 +1,49 @@
+"""
+Writes the spec documents of a registry to static files, so they can be
+served by a web server or a CDN instead of a Python worker.
+"""
+import errno
+import os
+
+from flask_sillywalk.sillywalk import SwaggerApiRegistry, SwaggerRegistryError
+
+
+def find_registry(obj):
+    """
+    Returns the registry of a Flask app, or the object itself if it already
+    is a registry.
+    """
+    if isinstance(obj, SwaggerApiRegistry):
+        return obj
+    registry = getattr(obj, "extensions", {}).get("sillywalk")
+    if registry is None:
+        raise SwaggerRegistryError(
+            "{0!r} has no {1}".format(obj, SwaggerApiRegistry.__name__))
+    return registry
+
+
+def export(registry, outdir, compress=True):
+    """
+    Writes every spec document to ``outdir``, along with a precompressed
+    ``.gz`` sibling. The files hold the exact bytes the live endpoints serve.
+    Returns the paths written.
+    """
+    try:
+        os.makedirs(outdir)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+    written = []
+    for route, document in registry.spec_documents():
+        path = os.path.join(outdir, route)
+        _write(path, document.encode())
+        written.append(path)
+        if compress:
+            _write(path + ".gz", document.encode("gzip"))
+            written.append(path + ".gz")
+    return written
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
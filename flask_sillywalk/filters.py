@@ -0,0 +1,185 @@
+"""
+Partial spec fetches: selecting operations by resource, path prefix and
+method without scanning every registered Api.
+"""
+import bisect
+
+from collections import OrderedDict
+
+
+class SpecFilter(object):
+    """
+    The part of the spec a client asked for, from the comma separated
+    ``resources``, ``methods`` and the ``pathPrefix`` query parameters.
+    """
+    __slots__ = ("resources", "path_prefix", "methods")
+
+    def __init__(self, resources=None, path_prefix=None, methods=None):
+        self.resources = frozenset(resources) if resources else None
+        self.path_prefix = path_prefix or None
+        self.methods = (frozenset(m.upper() for m in methods)
+                        if methods else None)
+
+    @classmethod
+    def from_args(cls, args, basepath=""):
+        """
+        Parses request arguments, returns None if they don't filter anything.
+        ``pathPrefix`` may include the basepath.
+        """
+        def split(name):
+            return [v.strip() for v in args.get(name, "").split(",")
+                    if v.strip()]
+
+        path_prefix = args.get("pathPrefix")
+        if path_prefix and basepath and path_prefix.startswith(basepath + "/"):
+            path_prefix = path_prefix[len(basepath):]
+        flt = cls(split("resources"), path_prefix, split("methods"))
+        if (flt.resources is None and flt.path_prefix is None and
+                flt.methods is None):
+            return None
+        return flt
+
+    @property
+    def key(self):
+        """
+        A normalized, hashable form of the filter.
+        """
+        return (tuple(sorted(self.resources)) if self.resources else None,
+                self.path_prefix,
+                tuple(sorted(self.methods)) if self.methods else None)
+
+
+class Selection(object):
+    """
+    The paths, by resource, and the methods a filter selected.
+    """
+    __slots__ = ("paths", "methods")
+
+    def __init__(self, candidates, methods=None):
+        self.paths = OrderedDict()
+        for resource, path in sorted(candidates):
+            self.paths.setdefault(resource, []).append(path)
+        self.methods = methods
+
+    def operations(self, apis):
+        if self.methods is None:
+            return apis
+        return [api for api in apis if api.httpMethod in self.methods]
+
+
+def _merged(items, added):
+    """
+    Returns the sorted tuple ``items`` with the ``added`` ones it lacks.
+    A few are inserted with bisect, more are merged by sorting once.
+    """
+    if len(added) > 32:
+        return tuple(sorted(set(items).union(added)))
+    items = list(items)
+    for item in added:
+        i = bisect.bisect_left(items, item)
+        if i == len(items) or items[i] != item:
+            items.insert(i, item)
+    return tuple(items)
+
+
+def _contains(items, item):
+    i = bisect.bisect_left(items, item)
+    return i != len(items) and items[i] == item
+
+
+class ResourceIndex(object):
+    """
+    The sorted paths of a single resource, and its sorted paths by method.
+    """
+    __slots__ = ("paths", "by_method")
+
+    def __init__(self, paths=(), by_method=None):
+        self.paths = paths
+        self.by_method = {} if by_method is None else by_method
+
+    def add(self, apis):
+        """
+        Returns a new ResourceIndex with ``apis`` added. Only the methods
+        of ``apis`` are copied, the others are shared with this one.
+        """
+        added = OrderedDict()
+        for api in apis:
+            added.setdefault(api.httpMethod, set()).add(api.path)
+        by_method = dict(self.by_method)
+        for method, paths in added.items():
+            by_method[method] = _merged(by_method.get(method, ()), paths)
+        paths = set().union(*added.values())
+        return ResourceIndex(_merged(self.paths, paths), by_method)
+
+    def select(self, path_prefix=None, methods=None):
+        paths = self.paths
+        if path_prefix is not None:
+            start = bisect.bisect_left(paths, path_prefix)
+            end = start
+            while end < len(paths) and paths[end].startswith(path_prefix):
+                end += 1
+            paths = paths[start:end]
+        if methods is not None:
+            indexes = [self.by_method[m] for m in methods
+                       if m in self.by_method]
+            paths = [p for p in paths
+                     if any(_contains(index, p) for index in indexes)]
+        return paths
+
+
+class OperationIndex(object):
+    """
+    Indexes the paths of the registered operations by resource, in sorted
+    order for prefix lookups, and by method. The index is never changed in
+    place: adding operations returns a new index sharing the untouched
+    resources, so readers can keep using the one they have.
+    """
+    __slots__ = ("resources", "names")
+
+    def __init__(self, resources=None, names=()):
+        self.resources = {} if resources is None else resources
+        # sorted resource names
+        self.names = names
+
+    def add(self, apis):
+        """
+        Returns a new OperationIndex with ``apis`` added.
+        """
+        by_resource = OrderedDict()
+        for api in apis:
+            by_resource.setdefault(api.resource, []).append(api)
+        resources = dict(self.resources)
+        for resource, added in by_resource.items():
+            resources[resource] = resources.get(
+                resource, ResourceIndex()).add(added)
+        names = self.names
+        if len(resources) != len(self.resources):
+            names = tuple(sorted(resources))
+        return OperationIndex(resources, names)
+
+    def _resource_names(self, flt):
+        if flt.resources is not None:
+            return sorted(r for r in flt.resources if r in self.resources)
+        if flt.path_prefix is None:
+            return self.names
+        head, sep, _ = flt.path_prefix.lstrip("/").partition("/")
+        if sep:
+            # the prefix names its resource in full
+            return [head] if head in self.resources else []
+        names = self.names
+        start = bisect.bisect_left(names, head)
+        end = start
+        while end < len(names) and names[end].startswith(head):
+            end += 1
+        return names[start:end]
+
+    def select(self, flt):
+        """
+        Returns the Selection of the operations matching ``flt``.
+        """
+        candidates = []
+        for resource in self._resource_names(flt):
+            candidates.extend(
+                (resource, path) for path in self.resources[resource].select(
+                    flt.path_prefix, flt.methods))
+        return Selection(candidates, flt.methods)
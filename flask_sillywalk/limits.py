@@ -0,0 +1,89 @@
+"""
+Per-operation concurrency limits. Requests beyond the limit wait up to a
+queue timeout for a slot, and are then turned away with a 503 instead of
+tying up another worker.
+"""
+import functools
+import threading
+
+import flask
+
+
+OVERLOADED = "Too many concurrent requests, try again later"
+
+
+class ConcurrencyLimit(object):
+    """
+    Lets at most ``max_concurrency`` requests of an operation in at once,
+    and counts those rejected after waiting ``queue_timeout`` seconds.
+    """
+    __slots__ = ("max_concurrency", "queue_timeout", "rejected",
+                 "_semaphore", "_lock")
+
+    def __init__(self, max_concurrency, queue_timeout=0):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.rejected = 0
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """
+        Takes a slot if one is free right away.
+        """
+        return self._semaphore.acquire(False)
+
+    def wait(self):
+        """
+        Waits up to the queue timeout for a slot.
+        """
+        if self.queue_timeout:
+            return self._semaphore.acquire(timeout=self.queue_timeout)
+        return False
+
+    def acquire(self):
+        if self.try_acquire() or self.wait():
+            return True
+        self.reject()
+        return False
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def release(self):
+        self._semaphore.release()
+
+    def document(self):
+        return {
+            "maxConcurrency": self.max_concurrency,
+            "queueTimeout": self.queue_timeout,
+            "rejected": self.rejected}
+
+
+def overloaded(message, dumps):
+    """
+    Returns the 503 response for a rejected request.
+    """
+    return flask.Response(
+        response=dumps({"code": 503, "message": message}),
+        status=503,
+        mimetype="application/json")
+
+
+def limit_view(f, limit, message, dumps):
+    """
+    Wraps the view ``f`` so it's called within ``limit``, requests it
+    rejects get a 503 with ``message``.
+    """
+
+    @functools.wraps(f)
+    def inner_func(*args, **kwargs):
+        if not limit.acquire():
+            return overloaded(message, dumps)
+        try:
+            return f(*args, **kwargs)
+        finally:
+            limit.release()
+
+    return inner_func
@@ -0,0 +1,103 @@
+"""
+Per-operation call counts, error counts and latency histograms.
+"""
+import bisect
+import functools
+import threading
+import time
+
+from werkzeug.exceptions import HTTPException
+
+
+timer = getattr(time, "perf_counter", time.time)
+
+# upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+
+class OperationMetrics(object):
+    """
+    Counters for a single documented operation. Latencies go into fixed
+    buckets, so recording a call is a bisect and a few increments.
+    """
+    __slots__ = ("calls", "errors", "latency_sum", "buckets", "_lock")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        # one more for everything slower than the last bound
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed, error=False):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, elapsed)
+        with self._lock:
+            self.calls += 1
+            if error:
+                self.errors += 1
+            self.latency_sum += elapsed
+            self.buckets[bucket] += 1
+
+    def document(self):
+        """
+        Returns a consistent copy of the counters, with cumulative bucket
+        counts.
+        """
+        with self._lock:
+            calls, errors = self.calls, self.errors
+            latency_sum, buckets = self.latency_sum, list(self.buckets)
+        histogram = []
+        count = 0
+        for le, n in zip(LATENCY_BUCKETS + ("+Inf",), buckets):
+            count += n
+            histogram.append({"le": le, "count": count})
+        return {
+            "calls": calls,
+            "errors": errors,
+            "latency": {"sum": latency_sum, "buckets": histogram}}
+
+
+def is_error(rv):
+    """
+    Whether a view's return value is a server error.
+    """
+    if isinstance(rv, tuple) and len(rv) > 1 and isinstance(rv[1], int):
+        return rv[1] >= 500
+    return getattr(rv, "status_code", 200) >= 500
+
+
+def raised_error(e):
+    """
+    Whether an exception a view raised is a server error: HTTP exceptions
+    like abort(404) are only if they're a 5xx.
+    """
+    if isinstance(e, HTTPException):
+        code = e.code if e.response is None else e.response.status_code
+        return code is None or code >= 500
+    return True
+
+
+def instrument(f, metrics):
+    """
+    Wraps the view ``f`` so every call is recorded in ``metrics``. Raising
+    anything but a 4xx HTTP exception, or returning a 5xx, counts as an
+    error.
+    """
+
+    @functools.wraps(f)
+    def inner_func(*args, **kwargs):
+        start = timer()
+        error = True
+        try:
+            rv = f(*args, **kwargs)
+            error = is_error(rv)
+            return rv
+        except BaseException as e:
+            error = raised_error(e)
+            raise
+        finally:
+            metrics.record(timer() - start, error)
+
+    return inner_func
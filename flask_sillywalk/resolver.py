@@ -0,0 +1,137 @@
+"""
+Maps request methods and paths to the documented operations they belong to.
+"""
+import re
+
+
+# what werkzeug's converters accept, those not in here accept any segment
+CONVERTERS = {
+    "int": re.compile(r"\d+$").match,
+    "float": re.compile(r"\d+\.\d+$").match}
+
+
+class _Node(object):
+    """
+    A path segment in the trie. ``param`` matches any single segment,
+    ``rest`` all the remaining ones (a path converter). ``operations`` maps
+    methods to the (api, parameter names, checks) of the paths ending here,
+    those whose parameters are more constrained by their converters first.
+    """
+    __slots__ = ("static", "param", "rest", "operations")
+
+    def __init__(self, static=None, param=None, rest=None, operations=None):
+        self.static = {} if static is None else static
+        self.param = param
+        self.rest = rest
+        self.operations = {} if operations is None else operations
+
+    def copy(self):
+        return _Node(dict(self.static), self.param, self.rest,
+                     dict(self.operations))
+
+
+def _segments(path):
+    return [segment for segment in path.split("/") if segment]
+
+
+def _parameter(segment):
+    """
+    Returns the name and converter of a ``{converter:name}`` segment, or
+    None if it's static.
+    """
+    if not (segment.startswith("{") and segment.endswith("}")):
+        return None
+    converter, _, name = segment[1:-1].rpartition(":")
+    return name, converter.split("(")[0]
+
+
+class OperationResolver(object):
+    """
+    A trie over the segments of the operations' paths. Lookups take time
+    proportional to the length of the path, not to the number of operations.
+    Like the OperationIndex, it is never changed in place: adding operations
+    returns a new resolver, copying only the nodes on their paths.
+    """
+    __slots__ = ("root",)
+
+    def __init__(self, root=None):
+        self.root = _Node() if root is None else root
+
+    def add(self, apis):
+        """
+        Returns a new OperationResolver with ``apis`` added.
+        """
+        root = self.root.copy()
+        copied = set([id(root)])
+
+        def child(node, attr, key=None):
+            if attr == "static":
+                current = node.static.get(key)
+            else:
+                current = getattr(node, attr)
+            if current is None:
+                current = _Node()
+            elif id(current) not in copied:
+                current = current.copy()
+            else:
+                return current
+            copied.add(id(current))
+            if attr == "static":
+                node.static[key] = current
+            else:
+                setattr(node, attr, current)
+            return current
+
+        for api in apis:
+            node = root
+            names = []
+            checks = []
+            for segment in _segments(api.path):
+                parameter = _parameter(segment)
+                if parameter is None:
+                    node = child(node, "static", segment)
+                    continue
+                name, converter = parameter
+                if converter in CONVERTERS:
+                    checks.append((len(names), CONVERTERS[converter]))
+                names.append(name)
+                if converter == "path":
+                    node = child(node, "rest")
+                    break
+                node = child(node, "param")
+            candidates = [c for c in node.operations.get(api.httpMethod, ())
+                          if c[0].path != api.path]
+            candidates.append((api, tuple(names), tuple(checks)))
+            candidates.sort(key=lambda c: -len(c[2]))
+            node.operations[api.httpMethod] = tuple(candidates)
+        return OperationResolver(root)
+
+    def resolve(self, method, path):
+        """
+        Returns the (api, parameter values) of the operation for ``method``
+        and ``path``, relative to the basepath, or None. Static segments take
+        precedence over parameters.
+        """
+        return self._resolve(self.root, method, _segments(path), 0, [])
+
+    def _resolve(self, node, method, segments, i, values):
+        if i == len(segments):
+            for api, names, checks in node.operations.get(method, ()):
+                if all(match(values[j]) for j, match in checks):
+                    return api, dict(zip(names, values))
+            return None
+        segment = segments[i]
+        static = node.static.get(segment)
+        if static is not None:
+            found = self._resolve(static, method, segments, i + 1, values)
+            if found is not None:
+                return found
+        if node.param is not None:
+            found = self._resolve(node.param, method, segments, i + 1,
+                                  values + [segment])
+            if found is not None:
+                return found
+        if node.rest is not None:
+            return self._resolve(node.rest, method, segments, len(segments),
+                                 values + ["/".join(segments[i:])])
+        return None
@@ -0,0 +1,79 @@
+"""
+Serializers compiled from registered model schemas. Each model gets plain
+functions that build its dicts with one attribute access per field, instead
+of walking every instance's __dict__.
+"""
+
+
+class Serializer(object):
+    """
+    The compiled serializer of a model. Calling it turns an instance into a
+    JSON-ready dict of the model's fields, ``serialize_many`` does a whole
+    list in one pass.
+    """
+    __slots__ = ("model", "fields", "serialize", "serialize_many")
+
+    def __init__(self, model, fields, serialize, serialize_many):
+        self.model = model
+        self.fields = fields
+        self.serialize = serialize
+        self.serialize_many = serialize_many
+
+    def __call__(self, obj):
+        return self.serialize(obj)
+
+    def __repr__(self):
+        return "<{0} {1}>".format(self.__class__.__name__, self.model)
+
+
+def model_fields(schema):
+    """
+    Returns the fields of a model schema, the required ones first. Every
+    constructor argument is either required or has a default, so together
+    they are all of them.
+    """
+    fields = list(schema.get("required", ()))
+    fields.extend(name for name in schema["properties"] if name not in fields)
+    return fields
+
+
+def compile_serializer(schema, nested=None, resolve=None):
+    """
+    Generates the Serializer of a model schema. ``nested`` maps fields
+    holding another model to its name, such fields are serialized with the
+    Serializer ``resolve`` returns for it, unless they are None. Models can
+    refer to each other, so that happens on first use.
+    """
+    nested = {} if nested is None else nested
+    fields = model_fields(schema)
+    namespace = {}
+    items = []
+    for i, name in enumerate(fields):
+        value = "obj.{0}".format(name)
+        if name in nested:
+            helper = "_nested{0}".format(i)
+            namespace[helper] = _nested(resolve, nested[name])
+            value = "{0}({1})".format(helper, value)
+        items.append("{0!r}: {1}".format(name, value))
+    row = "{" + ", ".join(items) + "}"
+    source = ("def serialize(obj):\n"
+              "    return {0}\n"
+              "def serialize_many(objs):\n"
+              "    return [{0} for obj in objs]\n").format(row)
+    exec(compile(source, "<serializer {0}>".format(schema["id"]), "exec"),
+         namespace)
+    return Serializer(schema["id"], tuple(fields), namespace["serialize"],
+                      namespace["serialize_many"])
+
+
+def _nested(resolve, model):
+    serializers = []
+
+    def inner_func(value):
+        if value is None:
+            return None
+        if not serializers:
+            serializers.append(resolve(model))
+        return serializers[0].serialize(value)
+
+    return inner_func
@@ -1,9 +1,31 @@
+import calendar
+import gzip
+import hashlib
 import inspect
+import io
 import json
+import threading
+import time
+import weakref
+import zlib
 import flask
 
-from collections import defaultdict
+from collections import OrderedDict
+from types import MappingProxyType
+from werkzeug.http import http_date
+from flask_sillywalk import aio
+from flask_sillywalk.batch import BatchRunner
+from flask_sillywalk.caching import cache_view
+from flask_sillywalk.changes import ChangeLog
 from flask_sillywalk.compat import urlparse
+from flask_sillywalk.encoding import encode_view, find_dumps
+from flask_sillywalk.filters import OperationIndex, SpecFilter
+from flask_sillywalk.limits import OVERLOADED, ConcurrencyLimit, limit_view
+from flask_sillywalk.metrics import OperationMetrics, instrument
+from flask_sillywalk.resolver import OperationResolver
+from flask_sillywalk.serializers import compile_serializer
+from flask_sillywalk.streaming import JSONObject, iterencode
+from flask_sillywalk.validation import validate_view
 
 
 __SWAGGERVERSION__ = "1.3"
@@ -24,49 +46,342 @@ class SwaggerApiRegistry(object):
     >>> registry = SwaggerApiRegistry(my_app, "http://my_url.com/api/v1")
 
     Then you can register URLs with this class' "register" method.
+
+    With an app factory, create the registry without an app and register
+    everything once. init_app then adds it all to each app it's given:
+
+    >>> registry = SwaggerApiRegistry(baseurl="http://my_url.com/api/v1")
+    >>> def create_app():
+    ...     app = Flask(__name__)
+    ...     registry.init_app(app)
+    ...     return app
     """
 
     def __init__(self, app=None, baseurl="http://localhost/",
-                 api_version="1.0", api_descriptions={}):
+                 api_version="1.0", api_descriptions={}, stream=False,
+                 metrics=False, json_dumps=None, encode_views=False,
+                 filter_cache_size=128, change_log_size=10000,
+                 shared_definitions=False, validate_requests=False,
+                 batch=False, batch_workers=8, batch_max_items=50):
         self.baseurl = baseurl
+        # encodes objects to JSON bytes, for documents and views alike
+        self.dumps = json_dumps if json_dumps is not None else find_dumps()
+        self.encode_views = encode_views
+        # check and coerce declared path, query and header parameters
+        self.validate_requests = validate_requests
+        # serve <basepath>/batch, running many operations per request
+        self.batch = None
+        if batch:
+            self.batch = BatchRunner(self, batch_workers, batch_max_items)
+        self.stream = stream
+        self.metrics = metrics
+        # emit each distinct parameter and response message once per
+        # document, with operations referring to it
+        self.shared_definitions = shared_definitions
+        self.operation_metrics = OrderedDict()
+        # (httpMethod, path) -> (api, ConcurrencyLimit)
+        self.operation_limits = OrderedDict()
         self.api_version = api_version
         self.api_descriptions = api_descriptions
         self.basepath = urlparse(self.baseurl).path
-        self.r = defaultdict(dict)
-        self.models = defaultdict(dict)
-        self.registered_routes = []
+        # r, models and _pending_models are never changed in place: writers
+        # swap in updated copies while holding _lock, so readers serving
+        # documents can use whatever they find without locking
+        self._lock = threading.RLock()
+        self.r = {}
+        self.models = {}
+        self._pending_models = OrderedDict()
+        self._interned = {}
+        # id of a registered definition ->
+        # (ref, section, document, reference to it, the definition itself)
+        self._refs = {}
+        self._serializers = {}
+        self.registered_routes = set()
+        # (rule, endpoint, view_func, options) of the app URL rules added,
+        # for the apps initialized later
+        self._routes = []
+        self._endpoints = set()
+        self._apps = weakref.WeakSet()
+        self._generation = 0
+        self._change_log = ChangeLog(change_log_size)
+        self._documents = {}
+        self.frozen = False
+        self._index = OperationIndex()
+        self._resolver = OperationResolver()
+        self._filtered = OrderedDict()
+        self._filtered_lock = threading.Lock()
+        self.filter_cache_size = filter_cache_size
+        self._modified = int(time.time())
+        self.app = app
         if app is not None:
-            self.app = app
             self.init_app(self.app)
 
     def init_app(self, app):
         """
         Initialize the Flask app by adding the base "resources" URL. Currently only JSON
         is supported, so this will add the URL <baseurl>/resources.json to your app.
+
+        Everything registered so far is added too, and everything registered
+        later will be. A registry can be initialized with any number of apps,
+        they share its views and cached documents.
         """
+        with self._lock:
+            self._add_base_urls(app)
+            for rule, endpoint, view_func, options in self._routes:
+                app.add_url_rule(rule, endpoint, view_func, **options)
+            self._apps.add(app)
+
+    def _add_base_urls(self, app):
+        app.extensions["sillywalk"] = self
         for fmt in SUPPORTED_FORMATS:
             app.add_url_rule(
                 "{0}/resources.{1}".format(
                     self.basepath.rstrip("/"),
                     fmt),
                 "resources",
-                self.jsonify(self.resources))
+                self._resources_view())
+            app.add_url_rule(
+                "{0}/spec.{1}".format(self.basepath.rstrip("/"), fmt),
+                "spec",
+                self._spec_view())
+            app.add_url_rule(
+                "{0}/changes.{1}".format(self.basepath.rstrip("/"), fmt),
+                "changes",
+                self.jsonify(self.show_changes))
+            if self.metrics:
+                app.add_url_rule(
+                    "{0}/metrics.{1}".format(self.basepath.rstrip("/"), fmt),
+                    "metrics",
+                    self._metrics_view())
+        if self.batch is not None:
+            app.add_url_rule(
+                "{0}/batch".format(self.basepath.rstrip("/")),
+                "batch",
+                self.batch.view,
+                methods=["POST"])
+
+    def _resources_view(self):
+        if self.stream:
+            return self.streamify(self.stream_resources)
+        return self.jsonify(self.resources, key=("resources",))
+
+    def _spec_view(self):
+        if self.stream:
+            return self.streamify(self.stream_spec)
+        return self.jsonify(self.spec, key=("spec",))
 
-    def jsonify(self, f):
+    def _metrics_view(self):
         """
-        In case we need to serialize different stuff in the future.
+        Metrics change with every call, so they're served without the
+        validators of jsonify: a conditional request must not get a 304.
+        """
+
+        def inner_func():
+            response = flask.Response(response=self.dumps(self.show_metrics()),
+                                      status=200,
+                                      mimetype="application/json")
+            response.cache_control.no_store = True
+            return response
+
+        return inner_func
+
+    def _resource_view(self, resource):
+        if self.stream:
+            return self.streamify(
+                lambda selection: self.stream_resource(resource, selection))
+        return self.jsonify(self.show_resource(resource),
+                            key=("resource", resource))
+
+    def streamify(self, g):
+        """
+        Like jsonify, but for generators of encoded chunks. Streamed
+        documents are neither cached nor compressed.
         """
 
         def inner_func():
-            return flask.Response(response=json.dumps(f()),
+            flt = self._spec_filter(flask.request.args)
+            selection = None
+            if flt is not None:
+                selection = self._index.select(flt)
+            return flask.Response(response=g(selection),
                     status=200,
                     mimetype="application/json")
 
         return inner_func
 
-    def resources(self):
+    def jsonify(self, f, key=None):
+        """
+        In case we need to serialize different stuff in the future.
+
+        If a cache ``key`` is given, the encoded document is kept until the
+        next registration bumps the registry generation. Responses carry an
+        ETag and Last-Modified, and conditional requests get a 304. Clients
+        accepting gzip or deflate get a variant compressed once per document.
+        Cached documents carry the registry version they were built from in
+        X-Spec-Version, to poll the changes endpoint from.
+
+        Cached documents can be filtered with the resources, pathPrefix and
+        methods query parameters, ``f`` then gets the Selection to build.
+        """
+
+        def inner_func():
+            if key is None:
+                document = _Document(self.dumps(f()),
+                                     self._modified)
+            else:
+                flt = self._spec_filter(flask.request.args)
+                if flt is None:
+                    document = self._document(key, f)
+                else:
+                    document = self._filtered_document(key, flt, f)
+            encoding = flask.request.accept_encodings.best_match(
+                COMPRESSORS)
+            etag = document.etag_for(encoding)
+            if document.not_modified(flask.request, etag):
+                response = flask.Response(status=304)
+            else:
+                response = flask.Response(response=document.encode(encoding),
+                        status=200,
+                        mimetype="application/json")
+                if encoding is not None:
+                    response.headers["Content-Encoding"] = encoding
+            response.set_etag(etag)
+            response.headers["Last-Modified"] = http_date(
+                document.last_modified)
+            response.vary.add("Accept-Encoding")
+            if document.version is not None:
+                response.headers["X-Spec-Version"] = str(document.version)
+            return response
+
+        return inner_func
+
+    def _document(self, key, f):
+        """
+        Returns the encoded spec document built by ``f``, re-encoding only
+        when the registry changed since it was cached.
+        """
+        generation = self._generation
+        modified = self._modified
+        cached = self._documents.get(key)
+        if cached is None or cached[0] != generation:
+            cached = (generation,
+                      _Document(self.dumps(f()), modified, generation))
+            self._documents[key] = cached
+        return cached[1]
+
+    def _spec_filter(self, args):
+        return SpecFilter.from_args(args, self.basepath.rstrip("/"))
+
+    def _filtered_document(self, key, flt, f):
+        """
+        Like _document, for a filtered document. The most recently used
+        ones are kept, up to filter_cache_size.
+        """
+        key = key + (flt.key,)
+        generation = self._generation
+        modified = self._modified
+        with self._filtered_lock:
+            cached = self._filtered.get(key)
+            if cached is not None:
+                self._filtered.move_to_end(key)
+        if cached is None or cached[0] != generation:
+            selection = self._index.select(flt)
+            cached = (generation,
+                      _Document(self.dumps(f(selection)), modified,
+                                generation))
+            with self._filtered_lock:
+                self._filtered[key] = cached
+                while len(self._filtered) > self.filter_cache_size:
+                    self._filtered.popitem(last=False)
+        return cached[1]
+
+    def spec_documents(self):
+        """
+        Yields the route (relative to the basepath) and the encoded document
+        of every spec document this registry serves.
+        """
+        for fmt in SUPPORTED_FORMATS:
+            yield ("resources.{0}".format(fmt),
+                   self._document(("resources",), self.resources))
+            yield ("spec.{0}".format(fmt),
+                   self._document(("spec",), self.spec))
+            for resource in list(self.r.keys()):
+                yield ("{0}.{1}".format(resource, fmt),
+                       self._document(("resource", resource),
+                                      self.show_resource(resource)))
+
+    def freeze(self):
+        """
+        Compiles every spec document, with its compressed variants, and stops
+        further registration. Call it in the master process before forking
+        workers: they then serve the very same bytes instead of each building
+        their own copy. Keeping the collector off them in the workers, e.g.
+        with gc.freeze() before forking, is up to the server setup.
+        """
+        with self._lock:
+            for route, document in self.spec_documents():
+                for encoding in COMPRESSORS:
+                    document.encode(encoding)
+            self.frozen = True
+            # nothing may be added to the compiled documents from now on
+            self._documents = MappingProxyType(self._documents)
+
+    def _check_frozen(self):
+        if self.frozen:
+            raise SwaggerRegistryError(
+                "{0} is frozen".format(self.__class__.__name__))
+
+    def _changed(self, changes=()):
+        """
+        Bumps the registry generation, invalidating every cached document,
+        and logs ``changes`` as made by the new generation.
+        """
+        self._change_log.append(self._generation + 1, changes)
+        self._generation += 1
+        # a change within the second served last must still look newer
+        self._modified = max(int(time.time()), self._modified + 1)
+
+    def show_changes(self):
+        """
+        Serialize the operations and models registered after the version in
+        the ``since`` query parameter. If that's unknown or too old to
+        answer, tells the client to reload the whole spec.
+        """
+        version = self._generation
+        try:
+            since = int(flask.request.args["since"])
+        except (KeyError, ValueError):
+            since = None
+        changes = None
+        if since is not None and since <= version:
+            changes = self._change_log.since(since)
+        if changes is None:
+            return {"version": version, "reload": True}
+        operations = []
+        names = []
+        for changed, kind, value in changes:
+            if changed > version:
+                break
+            if kind == "operation":
+                operations.append({
+                    "resource": value.resource,
+                    "path": value.path,
+                    "operation": value.document()})
+            elif value not in names:
+                names.append(value)
+        models = self._resolve_models()
+        return {
+            "version": version,
+            "since": since,
+            "reload": False,
+            "operations": operations,
+            "models": dict((name, models[name]) for name in names
+                           if name in models)}
+
+    def resources(self, selection=None):
         """
-        Gets all currently known API resources and serialized them.
+        Gets all currently known API resources and serialized them, or
+        just those with operations in ``selection``.
         """
         resources = {
             "apiVersion": self.api_version,
@@ -74,13 +389,13 @@ class SwaggerApiRegistry(object):
             "basePath": self.baseurl,
             "models": dict(),
             "apis": list()}
-        for resource in self.r.keys():
+        for resource in self._resource_names(self.r, selection):
             description = (self.api_descriptions[resource]
                            if resource in self.api_descriptions else "")
             resources["apis"].append({
                 "path": "/" + resource + ".{format}",
                 "description": description})
-        for k, v in self.models.items():
+        for k, v in self._resolve_models().items():
             resources["models"][k] = v
         return resources
 
@@ -98,32 +413,105 @@ class SwaggerApiRegistry(object):
         """
 
         def inner_func(c, *args, **kwargs):
-            if self.app is None:
-                raise SwaggerRegistryError(
-                    "You need to initialize {0} with a Flask app".format(
-                        self.__class__.__name__))
-            self.models[c.__name__] = {
-                "id": c.__name__,
-                "description": c.__doc__ if c.__doc__ is not None else "",
-                "type": type_,
-                "properties": dict()}
-            argspec = inspect.getargspec(c.__init__)
-            argspec.args.remove("self")
-            defaults = {}
-            if argspec.defaults:
-                defaults = list(zip(argspec.args[-len(
-                    argspec.defaults):], argspec.defaults))
-            for arg in argspec.args[:-len(defaults)]:
-                if self.models[c.__name__].get("required") is None:
-                    self.models[c.__name__]["required"] = []
-                self.models[c.__name__]["required"].append(arg)
-                # self.models[c.__name__]["required"][arg] = {"required": True}
-            for k, v in defaults:
-                self.models[c.__name__]["properties"][k] = {"default": v}
+            with self._lock:
+                self._check_frozen()
+                # introspected lazily, the first time the spec is served
+                models = dict(self.models)
+                models.pop(c.__name__, None)
+                pending = OrderedDict(self._pending_models)
+                pending[c.__name__] = (c, type_)
+                self.models, self._pending_models = models, pending
+                # nested serializers may refer to the model replaced
+                self._serializers = {}
+                self._changed([("model", c.__name__)])
             return c
 
         return inner_func
 
+    def serializer(self, c):
+        """
+        Returns the Serializer of the registered model ``c``, a class or its
+        name, compiled from its schema the first time it's asked for.
+
+        Usage:
+
+        >>> cheeses = my_registry.serializer(Cheese)
+        >>> return {"cheeses": cheeses.serialize_many(db.cheeses.all())}
+        """
+        name = getattr(c, "__name__", c)
+        serializer = self._serializers.get(name)
+        if serializer is not None:
+            return serializer
+        generation = self._generation
+        models = self._resolve_models()
+        if name not in models:
+            raise SwaggerRegistryError(
+                "{0} is not a registered model".format(name))
+        nested = dict((field, prop["$ref"]) for field, prop
+                      in models[name]["properties"].items()
+                      if prop.get("$ref") in models)
+        serializer = compile_serializer(models[name], nested, self.serializer)
+        with self._lock:
+            # unless models were registered meanwhile
+            if self._generation == generation:
+                serializers = dict(self._serializers)
+                serializers[name] = serializer
+                self._serializers = serializers
+        return serializer
+
+    def _intern(self, definition):
+        """
+        Returns the registered definition equal to ``definition``, so that
+        operations repeating the same parameter or error response share one
+        object.
+        """
+        try:
+            return self._interned.setdefault(definition._key(), definition)
+        except TypeError:
+            # unhashable, e.g. a list as default value
+            return definition
+
+    def _share(self, section, definition, label):
+        """
+        Names ``definition`` after its label and a hash of its content, so
+        documents can refer to it in their ``section`` of shared
+        definitions.
+        """
+        if id(definition) in self._refs:
+            return
+        document = definition.document()
+        digest = hashlib.sha1(json.dumps(
+            document, sort_keys=True, default=repr).encode("utf-8"))
+        ref = "{0}-{1}".format(label, digest.hexdigest()[:12])
+        # a JSON pointer into the document, the same object for every use
+        pointer = {"$ref": "#/{0}/{1}".format(
+            section, ref.replace("~", "~0").replace("/", "~1"))}
+        self._refs[id(definition)] = (ref, section, document, pointer,
+                                      definition)
+
+    def _shared(self):
+        """
+        Returns what collects the shared definitions of a document being
+        built, or None if they're inlined.
+        """
+        if self.shared_definitions:
+            return _SharedDefinitions(self._refs)
+        return None
+
+    def _resolve_models(self):
+        """
+        Builds the schema of every model registered since the last call,
+        and returns all models.
+        """
+        if self._pending_models:
+            with self._lock:
+                models = dict(self.models)
+                names = set(models) | set(self._pending_models)
+                for name, (c, type_) in self._pending_models.items():
+                    models[name] = model_schema(c, type_, names)
+                self.models, self._pending_models = models, OrderedDict()
+        return self.models
+
     def _register(self,
                   path,
                   f,
@@ -133,53 +521,200 @@ class SwaggerApiRegistry(object):
                   responseMessages,
                   nickname,
                   notes,
-                  bp):
+                  bp,
+                  cache=None,
+                  max_concurrency=None,
+                  queue_timeout=0):
+        with self._lock:
+            api = self._add_api(path, f, method, content_type, parameters,
+                                responseMessages, nickname, notes, bp, cache,
+                                max_concurrency, queue_timeout)
+            self._publish([api])
+
+    def _publish(self, apis):
+        """
+        Swaps in copies of r and the operation index with ``apis`` added.
+        Only the resources touched are copied.
+        """
+        r = dict(self.r)
+        copied = set()
+        for api in apis:
+            if api.resource not in copied:
+                r[api.resource] = dict(r.get(api.resource, {}))
+                copied.add(api.resource)
+            resource_map = r[api.resource]
+            resource_map[api.path] = resource_map.get(api.path, ()) + (api,)
+        index = self._index.add(apis)
+        resolver = self._resolver.add(apis)
+        # r first: an index never refers to paths its r doesn't have
+        self.r = r
+        self._index = index
+        self._resolver = resolver
+        self._changed([("operation", api) for api in apis])
 
-        if self.app is None:
+    def _add_api(self,
+                 path,
+                 f,
+                 method,
+                 content_type,
+                 parameters,
+                 responseMessages,
+                 nickname,
+                 notes,
+                 bp,
+                 cache=None,
+                 max_concurrency=None,
+                 queue_timeout=0):
+        self._check_frozen()
+        if cache is not None and method != "GET":
             raise SwaggerRegistryError(
-                "You need to initialize {0} with a Flask app".format(
-                    self.__class__.__name__))
+                "Only GET operations can be cached, not {0} {1}".format(
+                    method, path))
+        if max_concurrency is not None and not any(
+                e.code == 503 for e in responseMessages):
+            # document the rejections
+            responseMessages = list(responseMessages) + [
+                ApiErrorResponse(503, OVERLOADED)]
 
         # use basepath if not set by user
-        if self.basepath not in path:
-            path = self.basepath + "/" + path
-            path = path.replace("//", "/")
-
-        # register views on blueprints
-        app = self.app
+        basepath = self.basepath.rstrip("/")
+        if not (path == basepath or path.startswith(basepath + "/")):
+            path = basepath + "/" + path.lstrip("/")
 
-        if bp:
-            app = bp
+        api = Api(
+            method=f,
+            path=path[len(basepath):],
+            httpMethod=method,
+            params=[self._intern(p) for p in parameters],
+            responseMessages=[self._intern(e) for e in responseMessages],
+            nickname=nickname,
+            notes=notes,
+            cache=cache)
+        if max_concurrency is not None:
+            self.operation_limits[(api.httpMethod, api.path)] = (
+                api, ConcurrencyLimit(max_concurrency, queue_timeout))
+        if self.shared_definitions:
+            for p in api.parameters:
+                self._share("parameters", p, p.name)
+            for e in api.responseMessages:
+                self._share("responses", e, e.code)
 
-        app.add_url_rule(
+        # register views on blueprints
+        self._route(
+            bp,
             path,
             f.__name__,
-            f,
+            self._wrap_view(api, f),
             methods=[method])
 
-        api = Api(
-            method=f,
-            path=path.replace(self.basepath, ""),
-            httpMethod=method,
-            params=parameters,
-            responseMessages=responseMessages,
-            nickname=nickname,
-            notes=notes)
-
-        if api.resource not in self.app.view_functions:
-            for fmt in SUPPORTED_FORMATS:
-                route = "{0}/{1}.{2}".format(self.basepath.rstrip("/"),
-                                             api.resource, fmt)
-                if route not in self.registered_routes:
-                    self.registered_routes.append(route)
-                    self.app.add_url_rule(
-                        route,
-                        api.resource,
-                        self.jsonify(self.show_resource(api.resource)))
-
-        if self.r[api.resource].get(api.path) is None:
-            self.r[api.resource][api.path] = list()
-        self.r[api.resource][api.path].append(api)
+        for fmt in SUPPORTED_FORMATS:
+            route = "{0}/{1}.{2}".format(basepath, api.resource, fmt)
+            if self._endpoint_taken(api.resource):
+                # routed already, or taken by a view
+                break
+            if route not in self.registered_routes:
+                self.registered_routes.add(route)
+                self._route(
+                    None,
+                    route,
+                    api.resource,
+                    self._resource_view(api.resource))
+        return api
+
+    def _endpoint_taken(self, endpoint):
+        """
+        Whether ``endpoint`` was routed by the registry, or is a view of one
+        of the apps it has been initialized with.
+        """
+        return endpoint in self._endpoints or any(
+            endpoint in app.view_functions for app in list(self._apps))
+
+    def _route(self, bp, rule, endpoint, view_func, **options):
+        """
+        Adds a URL rule to the blueprint ``bp``, which defers it until it's
+        registered on an app, or else to every app the registry has been
+        initialized with. Those are recorded for the apps still to come.
+        """
+        if bp:
+            bp.add_url_rule(rule, endpoint, view_func, **options)
+            return
+        for app in list(self._apps):
+            app.add_url_rule(rule, endpoint, view_func, **options)
+        self._routes.append((rule, endpoint, view_func, options))
+        self._endpoints.add(endpoint)
+
+    def _wrap_view(self, api, f):
+        """
+        Returns the view function actually routed for the operation ``api``.
+        Coroutine views get coroutine wrappers, so they stay async.
+        """
+        if aio.is_async(f):
+            validate, limit, cache = (aio.validate_view, aio.limit_view,
+                                      aio.cache_view)
+            encode, measure = aio.encode_view, aio.instrument
+        else:
+            validate, limit, cache = validate_view, limit_view, cache_view
+            encode, measure = encode_view, instrument
+        if self.validate_requests:
+            f = validate(f, api.parameters, api.responseMessages, self.dumps)
+        if self.encode_views:
+            f = encode(f, self.dumps)
+        key = (api.httpMethod, api.path)
+        if key in self.operation_limits:
+            message = [e.message for e in api.responseMessages
+                       if e.code == 503][0]
+            f = limit(f, self.operation_limits[key][1], message, self.dumps)
+        if api.cache is not None:
+            # hits skip the rest, but are still measured
+            f = cache(f, api.cache, api.parameters)
+        if self.metrics:
+            if key not in self.operation_metrics:
+                self.operation_metrics[key] = (api, OperationMetrics())
+            f = measure(f, self.operation_metrics[key][1])
+        return f
+
+    def resolve(self, method, path):
+        """
+        Finds the documented operation a request belongs to. Returns the Api
+        and a dict of the path parameters, as strings, or None if there's no
+        such operation. ``path`` may include the basepath. HEAD requests
+        resolve to GET operations, like Flask routes them.
+
+        Usage:
+
+        >>> api, params = my_registry.resolve("GET", "/api/v1/cheese/brie")
+        >>> api.summary, params
+        ('Gets cheese, just like the name says.', {'cheeseName': 'brie'})
+        """
+        basepath = self.basepath.rstrip("/")
+        if basepath and (path == basepath or
+                         path.startswith(basepath + "/")):
+            path = path[len(basepath):]
+        resolver = self._resolver
+        method = method.upper()
+        found = resolver.resolve(method, path)
+        if found is None and method == "HEAD":
+            found = resolver.resolve("GET", path)
+        return found
+
+    def show_metrics(self):
+        """
+        Serialize the metrics of every instrumented operation.
+        """
+        operations = []
+        for api, metrics in list(self.operation_metrics.values()):
+            operation = {
+                "httpMethod": api.httpMethod,
+                "path": api.path,
+                "resource": api.resource,
+                "nickname": api.nickname}
+            operation.update(metrics.document())
+            limited = self.operation_limits.get(
+                (api.httpMethod, api.path))
+            if limited is not None:
+                operation["concurrency"] = limited[1].document()
+            operations.append(operation)
+        return {"operations": operations}
 
     def add_register(self,
                      path,
@@ -190,9 +725,17 @@ class SwaggerApiRegistry(object):
                      responseMessages=[],
                      nickname=None,
                      notes=None,
-                     bp=None):
+                     bp=None,
+                     cache=None,
+                     max_concurrency=None,
+                     queue_timeout=0):
         """
-        Registers an API endpoint.
+        Registers an API endpoint. GET operations can be cached as the
+        ApiCachePolicy ``cache`` says.
+
+        With ``max_concurrency``, requests beyond that many at once wait up
+        to ``queue_timeout`` seconds, and then get a 503, which is added to
+        the documented response messages unless one is declared already.
 
         Usage:
 
@@ -211,11 +754,50 @@ class SwaggerApiRegistry(object):
         ...     notes='For getting cheese, you know...',
         ...     responseMessages=[
         ...         ApiErrorResponse(400, "Sorry, we're fresh out of that cheese."),
-        ...         ApiErrorResponse(418, "I'm actually a teapot")]))
+        ...         ApiErrorResponse(418, "I'm actually a teapot")],
+        ...     cache=ApiCachePolicy(ttl=60, max_entries=1000))
 
         """
         self._register(path, f, method, content_type, parameters,
-                       responseMessages, nickname, notes, bp)
+                       responseMessages, nickname, notes, bp, cache,
+                       max_concurrency, queue_timeout)
+
+    def add_register_many(self, endpoints):
+        """
+        Registers many API endpoints in one pass. Each endpoint is a dict of
+        the keyword arguments add_register takes. The registry state is
+        copied and cached spec documents are invalidated once, after the
+        whole batch.
+
+        Usage:
+
+        >>> my_registry.add_register_many([
+        ...     {"path": "/api/v1/cheese/<cheeseName>", "f": get_cheese},
+        ...     {"path": "/api/v1/cheese", "f": add_cheese, "method": "POST"}])
+
+        """
+        apis = []
+        with self._lock:
+            self._check_frozen()
+            try:
+                for endpoint in endpoints:
+                    apis.append(self._add_api(
+                        endpoint["path"],
+                        endpoint["f"],
+                        endpoint.get("method", "GET"),
+                        endpoint.get("content_type", "application/json"),
+                        endpoint.get("parameters", []),
+                        endpoint.get("responseMessages", []),
+                        endpoint.get("nickname"),
+                        endpoint.get("notes"),
+                        endpoint.get("bp"),
+                        endpoint.get("cache"),
+                        endpoint.get("max_concurrency"),
+                        endpoint.get("queue_timeout", 0)))
+            finally:
+                # publish what made it in before a failure, if anything
+                if apis:
+                    self._publish(apis)
 
     def register(self,
                  path,
@@ -225,9 +807,14 @@ class SwaggerApiRegistry(object):
                  responseMessages=[],
                  nickname=None,
                  notes=None,
-                 bp=None):
+                 bp=None,
+                 cache=None,
+                 max_concurrency=None,
+                 queue_timeout=0):
         """
-        Registers an API endpoint.
+        Registers an API endpoint. GET operations can be cached as the
+        ApiCachePolicy ``cache`` says, and concurrent requests limited to
+        ``max_concurrency``, see add_register.
 
         Usage:
 
@@ -250,7 +837,8 @@ class SwaggerApiRegistry(object):
         """
         def inner_func(f):
             self._register(path, f, method, content_type, parameters,
-                           responseMessages, nickname, notes, bp)
+                           responseMessages, nickname, notes, bp, cache,
+                           max_concurrency, queue_timeout)
         return inner_func
 
     def show_resource(self, resource):
@@ -258,42 +846,321 @@ class SwaggerApiRegistry(object):
         Serialize a single resource.
         """
 
-        def inner_func():
+        def inner_func(selection=None):
+            shared = self._shared()
             return_value = {
                 "resourcePath": resource.rstrip("/"),
                 "apiVersion": self.api_version,
                 "swaggerVersion": __SWAGGERVERSION__,
                 "basePath": self.baseurl,
-                "apis": list(),
+                "apis": self._api_objects(self.r, resource, selection, shared),
                 "models": list()
             }
-            resource_map = self.r.get(resource)
-            for path, apis in resource_map.items():
-                api_object = {
-                    "path": path,
-                    "description": "",
-                    "operations": list()}
-                for api in apis:
-                    api_object["operations"].append(api.document())
-                return_value["apis"].append(api_object)
+            if shared is not None:
+                return_value.update(shared.sections)
             return return_value
 
         return inner_func
 
+    def _resource_names(self, r, selection=None):
+        if selection is None:
+            return list(r.keys())
+        return list(selection.paths)
+
+    def _paths(self, r, resource, selection=None):
+        """
+        Yields the paths of a resource in ``r`` and their operations, all of
+        them or those in ``selection``.
+        """
+        resource_map = r.get(resource, {})
+        if selection is None:
+            for path in list(resource_map):
+                yield path, resource_map[path]
+        else:
+            for path in selection.paths.get(resource, ()):
+                yield path, selection.operations(resource_map[path])
+
+    def _api_objects(self, r, resource, selection=None, shared=None):
+        ref = None if shared is None else shared.ref
+        api_objects = []
+        for path, apis in self._paths(r, resource, selection):
+            api_objects.append({
+                "path": path,
+                "description": "",
+                "operations": [api.document(ref) for api in apis]})
+        return api_objects
+
+    def spec(self, selection=None):
+        """
+        Serialize every resource, with its APIs inline, and all models as a
+        single document. A ``selection`` restricts the APIs.
+        """
+        models = self._resolve_models()
+        r = self.r
+        shared = self._shared()
+        apis = []
+        for resource in self._resource_names(r, selection):
+            apis.append({
+                "path": "/" + resource + ".{format}",
+                "description": self.api_descriptions.get(resource, ""),
+                "resourcePath": resource.rstrip("/"),
+                "apis": self._api_objects(r, resource, selection, shared)})
+        document = {
+            "apiVersion": self.api_version,
+            "swaggerVersion": __SWAGGERVERSION__,
+            "basePath": self.baseurl,
+            "models": dict(models),
+            "apis": apis}
+        if shared is not None:
+            document.update(shared.sections)
+        return document
+
+    def stream_resources(self, selection=None):
+        """
+        Like resources, but yields the document as encoded chunks.
+        """
+        models = self._resolve_models()
+        r = self.r
+
+        def apis():
+            for resource in self._resource_names(r, selection):
+                yield {
+                    "path": "/" + resource + ".{format}",
+                    "description": self.api_descriptions.get(resource, "")}
+
+        return iterencode(JSONObject([
+            ("apiVersion", self.api_version),
+            ("swaggerVersion", __SWAGGERVERSION__),
+            ("basePath", self.baseurl),
+            ("models", JSONObject(list(models.items()))),
+            ("apis", apis())]), self.dumps)
+
+    def stream_resource(self, resource, selection=None):
+        """
+        Like show_resource, but yields the document as encoded chunks, one
+        operation at a time.
+        """
+        shared = self._shared()
+
+        def items():
+            yield "resourcePath", resource.rstrip("/")
+            yield "apiVersion", self.api_version
+            yield "swaggerVersion", __SWAGGERVERSION__
+            yield "basePath", self.baseurl
+            yield "apis", self._stream_api_objects(self.r, resource,
+                                                   selection, shared)
+            yield "models", []
+            # only known once the operations are out
+            if shared is not None:
+                for section in shared.sections.items():
+                    yield section
+
+        return iterencode(JSONObject(items()), self.dumps)
+
+    def _stream_api_objects(self, r, resource, selection=None, shared=None):
+        ref = None if shared is None else shared.ref
+        for path, apis in self._paths(r, resource, selection):
+            yield JSONObject([
+                ("path", path),
+                ("description", ""),
+                ("operations", (api.document(ref) for api in apis))])
+
+    def stream_spec(self, selection=None):
+        """
+        Like spec, but yields the document as encoded chunks, one operation
+        at a time.
+        """
+        models = self._resolve_models()
+        r = self.r
+        shared = self._shared()
+
+        def apis():
+            for resource in self._resource_names(r, selection):
+                yield JSONObject([
+                    ("path", "/" + resource + ".{format}"),
+                    ("description", self.api_descriptions.get(resource, "")),
+                    ("resourcePath", resource.rstrip("/")),
+                    ("apis", self._stream_api_objects(r, resource, selection,
+                                                      shared))])
+
+        def items():
+            yield "apiVersion", self.api_version
+            yield "swaggerVersion", __SWAGGERVERSION__
+            yield "basePath", self.baseurl
+            yield "models", JSONObject(list(models.items()))
+            yield "apis", apis()
+            if shared is not None:
+                for section in shared.sections.items():
+                    yield section
+
+        return iterencode(JSONObject(items()), self.dumps)
+
+
+def _gzip(data):
+    buf = io.BytesIO()
+    with gzip.GzipFile(filename="", mode="wb", fileobj=buf, mtime=0) as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+# content codings we serve, in order of preference
+COMPRESSORS = OrderedDict([
+    ("gzip", _gzip),
+    ("deflate", zlib.compress)])
+
+
+# Swagger types of the builtins a model constructor may be annotated with
+SWAGGER_TYPES = {
+    "int": "integer",
+    "float": "number",
+    "str": "string",
+    "bool": "boolean",
+    "list": "array",
+    "dict": "object"}
+
+
+def model_schema(c, type_="object", models=()):
+    """
+    Builds the Swagger model of a class from the signature of its
+    constructor. Arguments without a default are required, annotations
+    become property types. Other annotations refer to a model if they're
+    strings or one of the ``models`` names, and are left out otherwise.
+    """
+    model = {
+        "id": c.__name__,
+        "description": c.__doc__ if c.__doc__ is not None else "",
+        "type": type_,
+        "properties": dict()}
+    required = []
+    parameters = list(inspect.signature(c.__init__).parameters.values())
+    for param in parameters[1:]:
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        prop = {}
+        if param.annotation is not param.empty:
+            annotation = param.annotation
+            forward = isinstance(annotation, str)
+            if not forward:
+                annotation = getattr(annotation, "__name__", None)
+            if annotation in SWAGGER_TYPES:
+                prop["type"] = SWAGGER_TYPES[annotation]
+            elif forward or annotation in models:
+                prop["$ref"] = annotation
+        if param.default is param.empty:
+            required.append(param.name)
+        else:
+            prop["default"] = param.default
+        if prop:
+            model["properties"][param.name] = prop
+    if required:
+        model["required"] = required
+    return model
+
+
+class _SharedDefinitions(object):
+    """
+    The shared definitions a document refers to, collected while building
+    it.
+    """
+    __slots__ = ("refs", "sections")
+
+    def __init__(self, refs):
+        self.refs = refs
+        self.sections = OrderedDict([("parameters", OrderedDict()),
+                                     ("responses", OrderedDict())])
+
+    def ref(self, definition):
+        ref, section, document, pointer = self.refs[id(definition)][:4]
+        self.sections[section][ref] = document
+        return pointer
+
+
+class _Document(object):
+    """
+    An encoded spec document along with its validators and compressed
+    variants.
+    """
+
+    def __init__(self, body, last_modified, version=None):
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.last_modified = last_modified
+        # the registry generation it was built from, if it's a spec document
+        self.version = version
+        self._variants = {}
+
+    def encode(self, encoding=None):
+        """
+        Returns the body in the given content coding, compressing it only
+        the first time it is asked for.
+        """
+        if encoding is None:
+            return self.body
+        body = self._variants.get(encoding)
+        if body is None:
+            body = COMPRESSORS[encoding](self.body)
+            self._variants[encoding] = body
+        return body
+
+    def etag_for(self, encoding=None):
+        """
+        Each content coding is a different representation, so it needs its
+        own strong ETag.
+        """
+        if encoding is None:
+            return self.etag
+        return "{0}-{1}".format(self.etag, encoding)
+
+    def not_modified(self, request, etag):
+        """
+        Whether a conditional request already has this exact document.
+        If-None-Match takes precedence over If-Modified-Since.
+        """
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(etag)
+        if request.if_modified_since is not None:
+            since = calendar.timegm(request.if_modified_since.utctimetuple())
+            return self.last_modified <= since
+        return False
+
+
+def _typed(value):
+    """
+    Pairs ``value``, and the items of a tuple, with its type: True, 1 and
+    1.0 are equal but document differently.
+    """
+    if isinstance(value, tuple):
+        return (tuple, tuple(_typed(v) for v in value))
+    return (type(value), value)
+
 
 class SwaggerDocumentable(object):
     """
     A documentable swagger object, e.g. an API endpoint, an API parameter, an API error response...
     """
+    __slots__ = ()
+    # the attributes that make up the swagger document, in order
+    _fields = ()
 
     def document(self):
-        return self.__dict__
+        return dict((f, getattr(self, f)) for f in self._fields)
+
+    def _key(self):
+        """
+        Identifies the definition, objects with equal keys are
+        interchangeable.
+        """
+        return (type(self),) + tuple(_typed(getattr(self, f))
+                                     for f in self._fields)
 
 
 class Api(SwaggerDocumentable):
     """
     A single API endpoint.
     """
+    _fields = ("httpMethod", "summary", "resource", "path", "parameters",
+               "responseMessages", "nickname", "notes")
+    __slots__ = _fields + ("cache",)
 
     def __init__(
             self,
@@ -303,7 +1170,8 @@ class Api(SwaggerDocumentable):
             params=None,
             responseMessages=None,
             nickname=None,
-            notes=None):
+            notes=None,
+            cache=None):
         self.httpMethod = httpMethod
         self.summary = method.__doc__ if method.__doc__ is not None else ""
         self.resource = path.lstrip("/").split("/")[0]
@@ -312,13 +1180,25 @@ class Api(SwaggerDocumentable):
         self.responseMessages = [] if responseMessages is None else responseMessages
         self.nickname = "" if nickname is None else nickname
         self.notes = notes
+        self.cache = cache
 
     # See https://github.com/wordnik/swagger-core/wiki/API-Declaration
-    def document(self):
-        ret = self.__dict__.copy()
+    def document(self, ref=None):
+        """
+        With ``ref``, parameters and response messages are replaced by what
+        it returns for them, e.g. references to shared definitions.
+        """
+        ret = super(Api, self).document()
         # need to serialize these guys
-        ret["parameters"] = [p.document() for p in self.parameters]
-        ret["responseMessages"] = [e.document() for e in self.responseMessages]
+        if ref is None:
+            ret["parameters"] = [p.document() for p in self.parameters]
+            ret["responseMessages"] = [e.document()
+                                       for e in self.responseMessages]
+        else:
+            ret["parameters"] = [ref(p) for p in self.parameters]
+            ret["responseMessages"] = [ref(e) for e in self.responseMessages]
+        if self.cache is not None:
+            ret["cache"] = self.cache.document()
         return ret
 
     def __hash__(self):
@@ -329,6 +1209,8 @@ class ApiParameter(SwaggerDocumentable):
     """
     A single API parameter
     """
+    __slots__ = _fields = ("name", "description", "required", "dataType",
+                           "paramType", "allowMultiple")
 
     def __init__(
             self,
@@ -345,27 +1227,41 @@ class ApiParameter(SwaggerDocumentable):
         self.paramType = paramType
         self.allowMultiple = allowMultiple
 
-    def document(self):
-        return self.__dict__
-
 
 class ImplicitApiParameter(ApiParameter):
     """
     Not sure what I was thinking here... --hobbeswalsh
     """
+    __slots__ = ("defaultValue",)
+    _fields = ApiParameter._fields + __slots__
 
     def __init__(self, *args, **kwargs):
         if "default_value" not in kwargs:
             raise TypeError(
                 "You need to provide an implicit param with a default value.")
+        self.defaultValue = kwargs.pop("default_value")
         super(ImplicitApiParameter, self).__init__(*args, **kwargs)
-        self.defaultValue = kwargs.get("default_value")
+
+
+class ApiCachePolicy(SwaggerDocumentable):
+    """
+    How the responses of a GET operation are cached: for ``ttl`` seconds,
+    ``max_entries`` of them at most, one per value of its declared
+    parameters and of the ``vary`` headers.
+    """
+    __slots__ = _fields = ("ttl", "maxEntries", "vary")
+
+    def __init__(self, ttl, max_entries=128, vary=()):
+        self.ttl = ttl
+        self.maxEntries = max_entries
+        self.vary = list(vary)
 
 
 class ApiErrorResponse(SwaggerDocumentable):
     """
     An API error response.
     """
+    __slots__ = _fields = ("code", "message")
 
     def __init__(self, code, message):
         self.message = message
@@ -0,0 +1,71 @@
+"""
+Incremental JSON encoding for spec documents that are too big to build in
+one go.
+"""
+import types
+
+from flask_sillywalk.encoding import stdlib_dumps
+
+
+class JSONObject(object):
+    """
+    A JSON object whose (key, value) pairs are produced lazily.
+    """
+    __slots__ = ("items",)
+
+    def __init__(self, items):
+        self.items = items
+
+
+def iterencode(value, dumps=stdlib_dumps, chunk_size=8192):
+    """
+    Encodes ``value`` as UTF-8 JSON chunks of roughly ``chunk_size`` bytes,
+    using the backend ``dumps`` for everything that isn't streamed.
+    Generators are encoded as arrays and JSONObjects as objects, item by item,
+    so only one item needs to be in memory at a time.
+    """
+    buf = []
+    size = 0
+    for part in _iterencode(value, dumps, separators(dumps)):
+        buf.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield b"".join(buf)
+            buf = []
+            size = 0
+    if buf:
+        yield b"".join(buf)
+
+
+def separators(dumps):
+    """
+    Returns the item and key separators ``dumps`` puts between what it
+    encodes, so streamed documents are the same bytes it would make of
+    them, e.g. b", " and b": " for json but b"," and b":" for orjson.
+    """
+    items = dumps([0, 0])
+    pair = dumps({"a": 0})
+    return items[2:-2], pair[4:-2]
+
+
+def _iterencode(value, dumps, separators):
+    item_separator, key_separator = separators
+    if isinstance(value, JSONObject):
+        yield b"{"
+        for i, (k, v) in enumerate(value.items):
+            if i:
+                yield item_separator
+            yield dumps(k) + key_separator
+            for part in _iterencode(v, dumps, separators):
+                yield part
+        yield b"}"
+    elif isinstance(value, types.GeneratorType):
+        yield b"["
+        for i, item in enumerate(value):
+            if i:
+                yield item_separator
+            for part in _iterencode(item, dumps, separators):
+                yield part
+        yield b"]"
+    else:
+        yield dumps(value)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+import asyncio
+import inspect
+import json
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import SwaggerApiRegistry, ApiParameter
+from flask.ext.sillywalk.compat import s
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:
+    WsgiToAsgi = None
+
+
+class TestAsyncViews(unittest.TestCase):
+
+    def _create_app(self):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1",
+                                      metrics=True, encode_views=True)
+
+        @registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path")])
+        async def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            await asyncio.sleep(0)
+            if cheeseName == "camembert":
+                return {"error": "It's runny"}, 503
+            return {"name": cheeseName}
+
+        return app, registry
+
+    def test_register(self):
+        app, registry = self._create_app()
+        view = app.view_functions["get_cheese"]
+        self.assertTrue(inspect.iscoroutinefunction(view))
+        api = registry.r["cheese"]["/cheese/{cheeseName}"][0]
+        self.assertEqual(api.summary,
+                         "Gets cheese, just like the name says.")
+
+    def test_wrappers(self):
+        app, registry = self._create_app()
+        view = app.view_functions["get_cheese"]
+        with app.test_request_context():
+            ret = asyncio.run(view(cheeseName="brie"))
+            self.assertEqual(ret.mimetype, "application/json")
+            self.assertEqual(json.loads(s(ret.data)), {"name": "brie"})
+            ret, status = asyncio.run(view(cheeseName="camembert"))
+            self.assertEqual(status, 503)
+        metrics = registry.operation_metrics[
+            ("GET", "/cheese/{cheeseName}")][1]
+        self.assertEqual((metrics.calls, metrics.errors), (2, 1))
+
+    @unittest.skipUnless(hasattr(Flask, "ensure_sync") and WsgiToAsgi,
+                         "Flask can't run async views")
+    def test_client(self):
+        app, registry = self._create_app()
+        client = app.test_client()
+        ret = client.get("/api/v1/cheese/brie")
+        self.assertEqual(ret.status_code, 200)
+        self.assertEqual(ret.mimetype, "application/json")
+        self.assertEqual(json.loads(s(ret.data)), {"name": "brie"})
+        ret = client.get("/api/v1/cheese/camembert")
+        self.assertEqual(ret.status_code, 503)
+        self.assertEqual(json.loads(s(ret.data)), {"error": "It's runny"})
+        metrics = registry.operation_metrics[
+            ("GET", "/cheese/{cheeseName}")][1]
+        self.assertEqual((metrics.calls, metrics.errors), (2, 1))
+
+    def test_overlapping_waits(self):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1",
+                                      metrics=True)
+        waiting = []
+
+        @registry.register("/api/v1/cheese/<cheeseName>")
+        async def get_cheese(cheeseName):
+            """Gets cheese from upstream."""
+            waiting.append(cheeseName)
+            await asyncio.sleep(0.01)
+            return "{0} {1}".format(cheeseName, len(waiting))
+
+        async def lookups():
+            view = app.view_functions["get_cheese"]
+            return await asyncio.gather(
+                *[view(cheeseName=name) for name in ["brie", "stilton"]])
+
+        # both lookups were waiting at the same time
+        self.assertEqual(asyncio.run(lookups()), ["brie 2", "stilton 2"])
+
+    @unittest.skipIf(WsgiToAsgi is None, "asgiref is not installed")
+    def test_asgi_spec(self):
+        app, registry = self._create_app()
+        asgi_app = WsgiToAsgi(app)
+
+        async def get(path):
+            scope = {"type": "http", "asgi": {"version": "3.0"},
+                     "http_version": "1.1", "method": "GET",
+                     "scheme": "http", "path": path, "raw_path": path.encode(),
+                     "query_string": b"", "root_path": "",
+                     "headers": [(b"host", b"localhost")],
+                     "server": ("localhost", 80), "client": ("127.0.0.1", 0)}
+            messages = []
+
+            async def receive():
+                return {"type": "http.request", "body": b"",
+                        "more_body": False}
+
+            async def send(message):
+                messages.append(message)
+
+            await asgi_app(scope, receive, send)
+            body = b"".join(m.get("body", b"") for m in messages
+                            if m["type"] == "http.response.body")
+            return messages[0]["status"], json.loads(s(body))
+
+        status, data = asyncio.run(get("/api/v1/spec.json"))
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            data["apis"][0]["apis"][0]["operations"][0]["summary"],
+            "Gets cheese, just like the name says.")
+        status, data = asyncio.run(get("/api/v1/resources.json"))
+        self.assertEqual([x["path"] for x in data["apis"]],
+                         ["/cheese.{format}"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+import gc
+import json
+import unittest
+
+from flask import Blueprint, Flask
+from flask.ext.sillywalk import SwaggerApiRegistry, ApiParameter
+from flask.ext.sillywalk.compat import s
+
+
+class TestAppFactory(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = SwaggerApiRegistry(
+            baseurl="http://localhost/api/v1", metrics=True)
+
+        @self.registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path")])
+        def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            return cheeseName
+
+        @self.registry.registerModel()
+        class Cheese(object):
+            def __init__(self, name, smelly=True):
+                pass
+
+    def create_app(self, bp=None):
+        app = Flask("foobar")
+        self.registry.init_app(app)
+        if bp is not None:
+            app.register_blueprint(bp)
+        return app
+
+    def _get(self, app, url):
+        ret = app.test_client().get(url)
+        self.assertEqual(ret.status_code, 200)
+        return ret.data
+
+    def test_many_apps(self):
+        apps = [self.create_app() for _ in range(3)]
+        for app in apps:
+            self.assertIs(app.extensions["sillywalk"], self.registry)
+            self.assertEqual(self._get(app, "/api/v1/cheese/brie"), b"brie")
+            data = json.loads(s(self._get(app, "/api/v1/resources.json")))
+            self.assertEqual([x["path"] for x in data["apis"]],
+                             ["/cheese.{format}"])
+            self.assertEqual(list(data["models"]), ["Cheese"])
+        # the documents are shared as well
+        self.assertEqual(
+            set(self._get(app, "/api/v1/cheese.json") for app in apps),
+            set([self._get(apps[0], "/api/v1/cheese.json")]))
+        metrics = self.registry.operation_metrics[
+            ("GET", "/cheese/{cheeseName}")][1]
+        self.assertEqual(metrics.calls, 3)
+
+    def test_register_after_init(self):
+        apps = [self.create_app() for _ in range(2)]
+
+        @self.registry.register("/api/v1/holyHandGrenade/<number>")
+        def get_a_holy_hand_grenade(number):
+            """Gets one or more holy hand grenades."""
+            return number
+
+        apps.append(self.create_app())
+        for app in apps:
+            self.assertEqual(self._get(app, "/api/v1/holyHandGrenade/3"),
+                             b"3")
+            self._get(app, "/api/v1/holyHandGrenade.json")
+
+    def test_resource_named_like_a_view(self):
+        app = self.create_app()
+
+        @app.route("/shrubbery")
+        def shrubbery():
+            return "Ni!"
+
+        @self.registry.register("/api/v1/shrubbery/<height>")
+        def get_shrubbery(height):
+            """Gets a shrubbery."""
+            return height
+
+        self.assertEqual(self._get(app, "/shrubbery"), b"Ni!")
+        self.assertEqual(self._get(app, "/api/v1/shrubbery/2"), b"2")
+
+    def test_blueprint(self):
+        bp = Blueprint("blueish", "foobar")
+
+        @self.registry.register("/api/v1/parrot", bp=bp)
+        def get_parrot():
+            """Gets the parrot."""
+            return "Pining for the fjords"
+
+        for app in [self.create_app(bp) for _ in range(2)]:
+            self.assertIn("blueish.get_parrot", app.view_functions)
+            self.assertEqual(self._get(app, "/api/v1/parrot"),
+                             b"Pining for the fjords")
+            self._get(app, "/api/v1/parrot.json")
+
+    def test_apps_not_kept(self):
+        self.create_app()
+        gc.collect()
+        self.assertEqual(len(self.registry._apps), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
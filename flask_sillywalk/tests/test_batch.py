@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+import json
+import threading
+import unittest
+
+from flask import Flask, Response, request
+from flask.ext.sillywalk import SwaggerApiRegistry, ApiParameter
+from flask.ext.sillywalk.compat import s
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask("foobar")
+        self.registry = SwaggerApiRegistry(
+            self.app, baseurl="http://localhost/api/v1", batch=True,
+            encode_views=True, batch_max_items=5)
+        self.client = self.app.test_client()
+        self.events = []
+        self.threads = set()
+        self.cheeses = {"brie": 3}
+
+        @self.registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path"),
+                        ApiParameter("age", "Age in months", False, "int",
+                                     "query")])
+        def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            self.events.append(("get", cheeseName))
+            self.threads.add(threading.current_thread().name)
+            if cheeseName not in self.cheeses:
+                return {"message": "Fresh out"}, 404
+            return {"name": cheeseName, "count": self.cheeses[cheeseName],
+                    "age": request.args.get("age"),
+                    "user": request.headers.get("X-User")}
+
+        @self.registry.register("/api/v1/cheese", method="POST")
+        def add_cheese():
+            """Adds cheese."""
+            name = request.get_json()["name"]
+            self.events.append(("add", name))
+            self.cheeses[name] = 1
+            return {"name": name}, 201
+
+        @self.registry.register("/api/v1/parrot")
+        def get_parrot():
+            """Gets the parrot."""
+            raise ValueError("This parrot is no more")
+
+        @self.registry.register("/api/v1/parrot/portrait")
+        def get_parrot_portrait():
+            """Gets a portrait of the parrot."""
+            return Response(b"\x89PNG\r\n\x1a\n", mimetype="image/png")
+
+    def _batch(self, items, **kwargs):
+        ret = self.client.post("/api/v1/batch", data=json.dumps(items),
+                               content_type="application/json", **kwargs)
+        return ret.status_code, json.loads(s(ret.data))
+
+    def test_batch(self):
+        status, results = self._batch([
+            {"path": "/api/v1/cheese/brie", "params": {"age": "12"}},
+            {"method": "GET", "path": "/cheese/stilton"},
+            {"method": "POST", "path": "/cheese", "body": {"name": "stilton"}},
+            {"path": "/cheese/stilton"}],
+            headers={"X-User": "Arthur"})
+        self.assertEqual(status, 200)
+        self.assertEqual(results, [
+            {"status": 200, "body": {"name": "brie", "count": 3,
+                                     "age": "12", "user": "Arthur"}},
+            {"status": 404, "body": {"message": "Fresh out"}},
+            {"status": 201, "body": {"name": "stilton"}},
+            {"status": 200, "body": {"name": "stilton", "count": 1,
+                                     "age": None, "user": "Arthur"}}])
+
+    def test_unsafe_barrier(self):
+        self._batch([
+            {"path": "/cheese/brie"},
+            {"path": "/cheese/gouda"},
+            {"method": "POST", "path": "/cheese", "body": {"name": "gouda"}},
+            {"path": "/cheese/gouda"},
+            {"path": "/cheese/brie"}])
+        self.assertEqual(set(self.events[:2]),
+                         set([("get", "brie"), ("get", "gouda")]))
+        self.assertEqual(self.events[2], ("add", "gouda"))
+        self.assertEqual(set(self.events[3:]),
+                         set([("get", "brie"), ("get", "gouda")]))
+        # safe sub-requests ran on the pool
+        self.assertTrue(all(name != threading.current_thread().name
+                            for name in self.threads))
+
+    def test_item_errors(self):
+        status, results = self._batch([
+            {"path": "/cheese/brie", "params": {"age": "old"}},
+            {"path": "/spam"},
+            {"method": "DELETE", "path": "/cheese/brie"},
+            {"path": "/parrot"},
+            {"path": "/batch", "method": "POST"}])
+        self.assertEqual(status, 200)
+        self.assertEqual([r["status"] for r in results],
+                         [400, 404, 404, 500, 404])
+        self.assertEqual(results[0]["body"]["errors"], [
+            {"name": "age", "paramType": "query",
+             "error": "not a valid int"}])
+        self.assertEqual(self.events, [])
+
+    def test_binary_body(self):
+        status, results = self._batch([
+            {"path": "/parrot/portrait"},
+            {"path": "/cheese/brie"}])
+        self.assertEqual(status, 200)
+        self.assertEqual(results[0], {"status": 200, "body": "iVBORw0KGgo=",
+                                      "encoding": "base64"})
+        self.assertEqual(results[1]["status"], 200)
+
+    def test_bad_batch(self):
+        for items in [{"path": "/cheese/brie"}, [{"method": "GET"}],
+                      [{"path": "/cheese/brie"}] * 6,
+                      [{"path": "/cheese/brie", "params": ["age"]}],
+                      [{"path": "/cheese/brie", "headers": "X-Ni: 1"}],
+                      [{"path": "/cheese/brie", "headers": {"X-Ni": [1]}}],
+                      [{"path": "/cheese/brie?age=5"}],
+                      [{"path": "/cheese/brie#age"}]]:
+            status, data = self._batch(items)
+            self.assertEqual(status, 400)
+            self.assertEqual(data["code"], 400)
+
+    def test_opt_in(self):
+        app = Flask("foobar")
+        SwaggerApiRegistry(app, baseurl="http://localhost/api/v1")
+        self.assertNotIn("batch", app.view_functions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from flask import Flask, current_app
+from flask.ext.sillywalk import (SwaggerApiRegistry, SwaggerRegistryError,
+                                 ApiParameter, ApiCachePolicy)
+from flask.ext.sillywalk.compat import s
+
+
+class TestCaching(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask("foobar")
+        self.registry = SwaggerApiRegistry(
+            self.app, baseurl="http://localhost/api/v1", metrics=True)
+        self.client = self.app.test_client()
+        self.calls = []
+
+        @self.registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path"),
+                        ApiParameter("age", "Age in months", False, "int",
+                                     "query")],
+            cache=ApiCachePolicy(ttl=60, max_entries=2,
+                                 vary=["Accept-Language"]))
+        def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            self.calls.append(cheeseName)
+            if cheeseName == "camembert":
+                return "It's runny", 404
+            return "{0} {1}".format(cheeseName, len(self.calls))
+
+        self.cache = self.app.view_functions["get_cheese"].cache
+
+    def _get(self, url, **kwargs):
+        ret = self.client.get(url, **kwargs)
+        return ret.status_code, s(ret.data)
+
+    def test_cached(self):
+        self.assertEqual(self._get("/api/v1/cheese/brie"), (200, "brie 1"))
+        self.assertEqual(self._get("/api/v1/cheese/brie"), (200, "brie 1"))
+        # undeclared query parameters don't matter, declared ones do
+        self.assertEqual(self._get("/api/v1/cheese/brie?utm_source=x"),
+                         (200, "brie 1"))
+        self.assertEqual(self._get("/api/v1/cheese/brie?age=3"),
+                         (200, "brie 2"))
+        self.assertEqual(self.calls, ["brie", "brie"])
+        metrics = self.registry.operation_metrics[
+            ("GET", "/cheese/{cheeseName}")][1]
+        self.assertEqual(metrics.calls, 4)
+
+    def test_vary(self):
+        ret = self.client.get("/api/v1/cheese/brie",
+                              headers={"Accept-Language": "fr"})
+        self.assertIn("Accept-Language", ret.headers["Vary"])
+        self.assertEqual(
+            self._get("/api/v1/cheese/brie",
+                      headers={"Accept-Language": "en"}), (200, "brie 2"))
+        self.assertEqual(
+            self._get("/api/v1/cheese/brie",
+                      headers={"Accept-Language": "fr"}), (200, "brie 1"))
+
+    def test_header_parameters_vary(self):
+        @self.registry.register(
+            "/api/v1/shop/<shopName>",
+            parameters=[ApiParameter("X-Region", "Region of the shop", False,
+                                     "str", "header")],
+            cache=ApiCachePolicy(ttl=60, max_entries=2))
+        def get_shop(shopName):
+            """Gets a cheese shop."""
+            self.calls.append(shopName)
+            return "{0} {1}".format(shopName, len(self.calls))
+
+        ret = self.client.get("/api/v1/shop/limburger",
+                              headers={"X-Region": "north"})
+        self.assertIn("X-Region", ret.headers["Vary"])
+        ret = self.client.get("/api/v1/shop/limburger",
+                              headers={"X-Region": "north"})
+        self.assertEqual(s(ret.data), "limburger 1")
+        self.assertIn("X-Region", ret.headers["Vary"])
+        self.assertEqual(
+            self._get("/api/v1/shop/limburger",
+                      headers={"X-Region": "south"}), (200, "limburger 2"))
+
+    def test_ttl(self):
+        now = [0.0]
+        self.cache.clock = lambda: now[0]
+        self._get("/api/v1/cheese/brie")
+        now[0] = 59.0
+        self.assertEqual(self._get("/api/v1/cheese/brie"), (200, "brie 1"))
+        now[0] = 60.0
+        self.assertEqual(self._get("/api/v1/cheese/brie"), (200, "brie 2"))
+
+    def test_max_entries(self):
+        for name in ["brie", "stilton", "gouda"]:
+            self._get("/api/v1/cheese/{0}".format(name))
+        self.assertEqual(len(self.cache), 2)
+        # the least recently used one went
+        self.assertEqual(self._get("/api/v1/cheese/brie"), (200, "brie 4"))
+
+    def test_errors_not_cached(self):
+        self.assertEqual(self._get("/api/v1/cheese/camembert")[0], 404)
+        self.assertEqual(self._get("/api/v1/cheese/camembert")[0], 404)
+        self.assertEqual(self.calls, ["camembert", "camembert"])
+
+    def test_stampede(self):
+        started = threading.Event()
+        release = threading.Event()
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1")
+        calls = []
+
+        @registry.register(
+            "/api/v1/parrot",
+            cache=ApiCachePolicy(ttl=60))
+        def get_parrot():
+            """Gets the parrot."""
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "Pining for the fjords"
+
+        results = []
+
+        def get():
+            results.append(app.test_client().get("/api/v1/parrot").data)
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        threads[0].start()
+        started.wait(5)
+        for t in threads[1:]:
+            t.start()
+        # let them all miss while the first one is computing
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [b"Pining for the fjords"] * 8)
+
+    def test_failed_response_released(self):
+        calls = []
+
+        @self.registry.register("/api/v1/parrot",
+                                cache=ApiCachePolicy(ttl=60))
+        def get_parrot():
+            """Gets the parrot."""
+            calls.append(1)
+            # not a response, make_response raises
+
+        for _ in range(2):
+            self.assertEqual(self.client.get("/api/v1/parrot").status_code,
+                             500)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.app.view_functions["get_parrot"].cache._pending,
+                         {})
+
+    def test_wait_timeout(self):
+        release = threading.Event()
+        calls = []
+
+        @self.registry.register("/api/v1/parrot",
+                                cache=ApiCachePolicy(ttl=60))
+        def get_parrot():
+            """Gets the parrot."""
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+            return "Pining for the fjords {0}".format(len(calls))
+
+        self.app.view_functions["get_parrot"].cache.wait_timeout = 0.1
+        stuck = threading.Thread(
+            target=lambda: self.client.get("/api/v1/parrot"))
+        stuck.start()
+        while not calls:
+            time.sleep(0.01)
+        # doesn't wait for the stuck request any longer than that
+        self.assertEqual(self._get("/api/v1/parrot"),
+                         (200, "Pining for the fjords 2"))
+        release.set()
+        stuck.join(5)
+
+    def test_apps_not_shared(self):
+        registry = SwaggerApiRegistry(baseurl="http://localhost/api/v1")
+
+        @registry.register("/api/v1/parrot", cache=ApiCachePolicy(ttl=60))
+        def get_parrot():
+            """Gets the parrot."""
+            return current_app.name
+
+        for name in ["norwegian", "blue"]:
+            app = Flask(name)
+            registry.init_app(app)
+            for _ in range(2):
+                self.assertEqual(app.test_client().get("/api/v1/parrot").data,
+                                 name.encode("utf-8"))
+
+    def test_async(self):
+        calls = []
+
+        @self.registry.register("/api/v1/parrot",
+                                cache=ApiCachePolicy(ttl=60))
+        async def get_parrot():
+            """Gets the parrot."""
+            calls.append(1)
+            return "Pining for the fjords"
+
+        view = self.app.view_functions["get_parrot"]
+        for _ in range(2):
+            with self.app.test_request_context("/api/v1/parrot"):
+                ret = asyncio.run(view())
+            self.assertEqual(ret.data, b"Pining for the fjords")
+        self.assertEqual(len(calls), 1)
+
+    def test_documented(self):
+        data = json.loads(s(self.client.get("/api/v1/cheese.json").data))
+        operation = data["apis"][0]["operations"][0]
+        self.assertEqual(operation["cache"], {
+            "ttl": 60, "maxEntries": 2, "vary": ["Accept-Language"]})
+
+    def test_get_only(self):
+        with self.assertRaises(SwaggerRegistryError):
+            self.registry.add_register(
+                "/api/v1/cheese", lambda: "", method="POST",
+                cache=ApiCachePolicy(ttl=60))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+import json
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import SwaggerApiRegistry, ApiParameter
+from flask.ext.sillywalk.changes import ChangeLog
+
+
+class TestChangeLog(unittest.TestCase):
+
+    def test_since(self):
+        log = ChangeLog()
+        log.append(1, [("operation", "a"), ("operation", "b")])
+        log.append(2, [("model", "Cheese")])
+        self.assertEqual(log.since(0), [(1, "operation", "a"),
+                                        (1, "operation", "b"),
+                                        (2, "model", "Cheese")])
+        self.assertEqual(log.since(1), [(2, "model", "Cheese")])
+        self.assertEqual(log.since(2), [])
+
+    def test_trimmed(self):
+        log = ChangeLog(size=2)
+        for version in range(1, 6):
+            log.append(version, [("operation", version)])
+        # only the newest changes are kept, older versions must reload
+        self.assertIsNone(log.since(0))
+        self.assertIsNone(log.since(2))
+        self.assertEqual(log.since(3), [(4, "operation", 4),
+                                        (5, "operation", 5)])
+
+
+class TestChanges(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask("foobar")
+        self.registry = SwaggerApiRegistry(
+            self.app, baseurl="http://localhost/api/v1")
+        self.client = self.app.test_client()
+
+        @self.registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path")])
+        def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            return cheeseName
+
+    def _get(self, url):
+        ret = self.client.get(url)
+        self.assertEqual(ret.status_code, 200)
+        return json.loads(ret.data.decode("utf-8"))
+
+    def test_changes_since(self):
+        # nothing is dispatched before the registrations below, Flask
+        # refuses new routes once an app has handled a request
+        version = self.registry._generation
+
+        @self.registry.register("/api/v1/holyHandGrenade/<number>")
+        def get_a_holy_hand_grenade(number):
+            """Gets one or more holy hand grenades."""
+            return number
+
+        @self.registry.registerModel()
+        class Cheese(object):
+            def __init__(self, name, smelly=True):
+                pass
+
+        data = self._get("/api/v1/changes.json?since={0}".format(version))
+        self.assertFalse(data["reload"])
+        self.assertEqual(data["since"], version)
+        self.assertEqual(data["version"], version + 2)
+        self.assertEqual(
+            [(x["resource"], x["path"], x["operation"]["summary"])
+             for x in data["operations"]],
+            [("holyHandGrenade", "/holyHandGrenade/{number}",
+              "Gets one or more holy hand grenades.")])
+        self.assertEqual(list(data["models"]), ["Cheese"])
+        self.assertEqual(data["models"]["Cheese"]["required"], ["name"])
+        # the new version is what the spec documents are built from now
+        ret = self.client.get("/api/v1/spec.json")
+        self.assertEqual(int(ret.headers["X-Spec-Version"]), data["version"])
+        data = self._get("/api/v1/changes.json?since={0}".format(
+            data["version"]))
+        self.assertEqual(data["operations"], [])
+        self.assertEqual(data["models"], {})
+
+    def test_reload(self):
+        version = self.registry._generation
+        for url in ["/api/v1/changes.json",
+                    "/api/v1/changes.json?since=cheese",
+                    "/api/v1/changes.json?since={0}".format(version + 1)]:
+            self.assertEqual(self._get(url),
+                             {"version": version, "reload": True})
+
+    def test_reload_when_trimmed(self):
+        self.registry._change_log.size = 1
+        for number in range(3):
+            def shrubbery():
+                return "Ni!"
+            shrubbery.__name__ = "shrubbery{0}".format(number)
+            self.registry.add_register(
+                "/api/v1/shrubbery{0}".format(number), shrubbery)
+        self.assertTrue(self._get("/api/v1/changes.json?since=0")["reload"])
+        since = self.registry._generation - 1
+        data = self._get("/api/v1/changes.json?since={0}".format(since))
+        self.assertFalse(data["reload"])
+        self.assertEqual([x["path"] for x in data["operations"]],
+                         ["/shrubbery2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+import json
+import threading
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import SwaggerApiRegistry
+from flask.ext.sillywalk.filters import SpecFilter
+
+
+WRITERS = 4
+OPERATIONS = 60
+
+
+def make_view(name):
+    def view(**kwargs):
+        """Does things."""
+        return "OK"
+    view.__name__ = name
+    return view
+
+
+class TestConcurrency(unittest.TestCase):
+
+    def test_registration_while_reading(self):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1")
+        registry.add_register("/api/v1/cheese/<cheeseName>",
+                              make_view("get_cheese"))
+        spec_view = app.view_functions["spec"]
+        # apps mustn't match requests while routes are added, so readers
+        # get their request contexts from an app without any
+        reader = Flask("reader")
+        errors = []
+        done = threading.Event()
+
+        def write(n):
+            try:
+                for i in range(OPERATIONS):
+                    registry.add_register(
+                        "/api/v1/res{0}/path{1}/<id>".format(i % 5, i),
+                        make_view("view_{0}_{1}".format(n, i)),
+                        method=["GET", "POST", "PUT", "DELETE"][n])
+                    if i % 10 == 0:
+                        registry.registerModel()(
+                            type("Model{0}_{1}".format(n, i), (object,), {}))
+                registry.add_register_many(
+                    {"path": "/api/v1/bulk{0}/{1}".format(n, i),
+                     "f": make_view("bulk_{0}_{1}".format(n, i))}
+                    for i in range(OPERATIONS))
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            try:
+                while not done.is_set():
+                    registry.spec()
+                    registry.resources()
+                    registry.show_resource("res0")()
+                    b"".join(registry.stream_spec())
+                    registry._index.select(SpecFilter(methods=["GET"]))
+                    with reader.test_request_context(
+                            "/api/v1/spec.json?pathPrefix=/res"):
+                        self.assertEqual(spec_view().status_code, 200)
+                    with reader.test_request_context("/api/v1/spec.json"):
+                        self.assertEqual(spec_view().status_code, 200)
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        writers = [threading.Thread(target=write, args=(n,))
+                   for n in range(WRITERS)]
+        for t in readers + writers:
+            t.start()
+        for t in writers:
+            t.join()
+        done.set()
+        for t in readers:
+            t.join()
+        self.assertEqual(errors, [])
+
+        with app.test_request_context("/api/v1/spec.json"):
+            spec = json.loads(spec_view().data.decode("utf-8"))
+        operations = sum(len(api["operations"])
+                         for resource in spec["apis"]
+                         for api in resource["apis"])
+        self.assertEqual(operations, 1 + WRITERS * OPERATIONS * 2)
+        self.assertEqual(len(spec["models"]), WRITERS * OPERATIONS // 10)
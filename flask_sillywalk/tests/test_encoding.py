@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+import json
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import SwaggerApiRegistry
+from flask.ext.sillywalk.compat import s
+from flask.ext.sillywalk.encoding import backends, find_dumps, stdlib_dumps
+
+
+class TestEncoding(unittest.TestCase):
+
+    def _create_app(self, **kwargs):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1",
+                                      **kwargs)
+
+        @registry.register("/api/v1/cheese/<cheeseName>")
+        def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            if cheeseName == "camembert":
+                return {"error": "It's runny"}, 404
+            return {"name": cheeseName, "tags": ["smelly"]}
+
+        @registry.register("/api/v1/cheese")
+        def list_cheese():
+            """Lists cheese."""
+            return ["brie", "cheddar"]
+
+        return app, registry
+
+    def test_backends(self):
+        names = [name for name, dumps in backends()]
+        self.assertEqual(names[-1], "json")
+        self.assertIs(find_dumps(), backends()[0][1])
+        for name, dumps in backends():
+            self.assertEqual(json.loads(s(dumps({"a": [1, "/b"]}))),
+                             {"a": [1, "/b"]})
+
+    def test_json_dumps_hook(self):
+        calls = []
+
+        def dumps(obj):
+            calls.append(obj)
+            return stdlib_dumps(obj)
+
+        app, registry = self._create_app(json_dumps=dumps)
+        ret = app.test_client().get("/api/v1/cheese.json")
+        self.assertEqual(json.loads(s(ret.data))["resourcePath"], "cheese")
+        self.assertEqual(len(calls), 1)
+
+    def test_encode_views(self):
+        app, registry = self._create_app(encode_views=True)
+        client = app.test_client()
+        ret = client.get("/api/v1/cheese/brie")
+        self.assertEqual(ret.mimetype, "application/json")
+        self.assertEqual(json.loads(s(ret.data)),
+                         {"name": "brie", "tags": ["smelly"]})
+        ret = client.get("/api/v1/cheese/camembert")
+        self.assertEqual(ret.status_code, 404)
+        self.assertEqual(json.loads(s(ret.data)), {"error": "It's runny"})
+        ret = client.get("/api/v1/cheese")
+        self.assertEqual(json.loads(s(ret.data)), ["brie", "cheddar"])
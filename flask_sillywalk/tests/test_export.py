@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import SwaggerApiRegistry, ApiParameter
+from flask.ext.sillywalk.__main__ import main
+from flask.ext.sillywalk.export import export
+
+
+APP = textwrap.dedent('''
+    from flask import Flask
+    from flask_sillywalk import SwaggerApiRegistry
+
+    app = Flask("cheeseShop")
+    registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1")
+
+    @registry.register("/api/v1/cheese/<cheeseName>")
+    def get_cheese(cheeseName):
+        """Gets cheese, just like the name says."""
+        return cheeseName
+''')
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.outdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir)
+
+    def _read(self, name):
+        with open(os.path.join(self.outdir, name), "rb") as f:
+            return f.read()
+
+    def test_export_matches_live_documents(self):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1")
+
+        @registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path")])
+        def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            return cheeseName
+
+        @registry.registerModel()
+        class Cheese(object):
+            def __init__(self, name, smelly=True):
+                pass
+
+        export(registry, self.outdir)
+        self.assertEqual(sorted(os.listdir(self.outdir)),
+                         ["cheese.json", "cheese.json.gz",
+                          "resources.json", "resources.json.gz",
+                          "spec.json", "spec.json.gz"])
+        client = app.test_client()
+        for name in ["cheese.json", "resources.json", "spec.json"]:
+            live = client.get("/api/v1/" + name).data
+            self.assertEqual(self._read(name), live)
+            gz = client.get("/api/v1/" + name,
+                            headers={"Accept-Encoding": "gzip"}).data
+            self.assertEqual(self._read(name + ".gz"), gz)
+            with gzip.open(os.path.join(self.outdir, name + ".gz")) as f:
+                self.assertEqual(f.read(), live)
+
+    def test_cli(self):
+        moddir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, moddir)
+        with open(os.path.join(moddir, "sillywalk_export_app.py"), "w") as f:
+            f.write(APP)
+        sys.path.insert(0, moddir)
+        self.addCleanup(sys.path.remove, moddir)
+        outdir = os.path.join(self.outdir, "spec")
+        self.assertEqual(
+            main(["export", "sillywalk_export_app:app", outdir, "--no-gzip"]),
+            0)
+        self.assertEqual(sorted(os.listdir(outdir)),
+                         ["cheese.json", "resources.json", "spec.json"])
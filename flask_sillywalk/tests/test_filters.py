@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+import json
+import unittest
+
+from flask import Flask, request
+from flask.ext.sillywalk import SwaggerApiRegistry
+from flask.ext.sillywalk.compat import s
+from flask.ext.sillywalk.filters import ResourceIndex, SpecFilter
+
+
+class FakeApi(object):
+
+    def __init__(self, httpMethod, path):
+        self.httpMethod = httpMethod
+        self.path = path
+
+
+class TestFilters(unittest.TestCase):
+
+    def _create_app(self, **kwargs):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1",
+                                      **kwargs)
+
+        def make_view(i):
+            def view(**kwargs):
+                """Does things."""
+                return "OK"
+            view.__name__ = "view_{0}".format(i)
+            return view
+
+        registry.add_register_many(
+            {"path": path, "f": make_view(i), "method": method}
+            for i, (path, method) in enumerate([
+                ("/cheese/<cheeseName>", "GET"),
+                ("/cheese/<cheeseName>", "DELETE"),
+                ("/cheese", "POST"),
+                ("/cheeseShop/owner", "GET"),
+                ("/holyHandGrenade/<number>", "POST")]))
+        return app, registry
+
+    def _get(self, app, url):
+        return json.loads(s(app.test_client().get(url).data))
+
+    def _peek(self, app, url):
+        # calls the view without dispatching, so the app still takes routes
+        with app.test_request_context(url):
+            view = app.view_functions[request.url_rule.endpoint]
+            rv = app.make_response(view(**request.view_args))
+            return json.loads(s(rv.get_data()))
+
+    def _operations(self, data):
+        return sorted((api["path"], op["httpMethod"])
+                      for api in data["apis"] for op in api["operations"])
+
+    def test_spec_filter_key(self):
+        self.assertEqual(SpecFilter.from_args({}), None)
+        self.assertEqual(
+            SpecFilter.from_args({"methods": "get, Post,",
+                                  "resources": "b,a,b"}).key,
+            (("a", "b"), None, ("GET", "POST")))
+        self.assertEqual(
+            SpecFilter.from_args({"pathPrefix": "/api/v1/cheese"},
+                                 "/api/v1").key,
+            (None, "/cheese", None))
+
+    def test_resource_index(self):
+        index = ResourceIndex().add(
+            [FakeApi("GET", "/cheese/{0:02}".format(i)) for i in range(40)])
+        added = index.add([FakeApi("DELETE", "/cheese/05"),
+                           FakeApi("DELETE", "/cheese/50")])
+        self.assertEqual(len(added.paths), 41)
+        self.assertEqual(list(added.paths), sorted(added.paths))
+        self.assertIs(added.by_method["GET"], index.by_method["GET"])
+        self.assertEqual(added.by_method["DELETE"],
+                         ("/cheese/05", "/cheese/50"))
+        self.assertEqual(added.select("/cheese/0", ["DELETE", "POST"]),
+                         ["/cheese/05"])
+        self.assertEqual(added.add([FakeApi("GET", "/cheese/50")]).paths,
+                         added.paths)
+
+    def test_resources(self):
+        app, registry = self._create_app()
+        data = self._get(app, "/api/v1/resources.json?methods=POST")
+        self.assertEqual([x["path"] for x in data["apis"]],
+                         ["/cheese.{format}", "/holyHandGrenade.{format}"])
+        data = self._get(app, "/api/v1/resources.json?pathPrefix=/cheese")
+        self.assertEqual([x["path"] for x in data["apis"]],
+                         ["/cheese.{format}", "/cheeseShop.{format}"])
+        data = self._get(app, "/api/v1/resources.json?resources=cheeseShop")
+        self.assertEqual([x["path"] for x in data["apis"]],
+                         ["/cheeseShop.{format}"])
+
+    def test_resource(self):
+        app, registry = self._create_app()
+        data = self._get(app, "/api/v1/cheese.json?methods=get,delete")
+        self.assertEqual(self._operations(data),
+                         [("/cheese/{cheeseName}", "DELETE"),
+                          ("/cheese/{cheeseName}", "GET")])
+        data = self._get(
+            app, "/api/v1/cheese.json?pathPrefix=/api/v1/cheese/&methods=GET")
+        self.assertEqual(self._operations(data),
+                         [("/cheese/{cheeseName}", "GET")])
+
+    def test_spec(self):
+        app, registry = self._create_app()
+        data = self._get(
+            app, "/api/v1/spec.json?resources=cheese,holyHandGrenade"
+                 "&methods=POST")
+        self.assertEqual([x["resourcePath"] for x in data["apis"]],
+                         ["cheese", "holyHandGrenade"])
+        self.assertEqual(self._operations(data["apis"][0]),
+                         [("/cheese", "POST")])
+        unfiltered = self._get(app, "/api/v1/spec.json")
+        self.assertEqual(len(unfiltered["apis"]), 3)
+
+    def test_streamed(self):
+        app, registry = self._create_app(stream=True)
+        data = self._get(app, "/api/v1/spec.json?pathPrefix=/holy")
+        self.assertEqual([x["resourcePath"] for x in data["apis"]],
+                         ["holyHandGrenade"])
+
+    def test_filtered_cache(self):
+        app, registry = self._create_app(filter_cache_size=2)
+        first = self._peek(app, "/api/v1/spec.json?methods=GET")
+        self._peek(app, "/api/v1/spec.json?methods=get")
+        self.assertEqual(len(registry._filtered), 1)
+        self._peek(app, "/api/v1/spec.json?methods=POST")
+        self._peek(app, "/api/v1/spec.json?methods=DELETE")
+        self.assertEqual(len(registry._filtered), 2)
+
+        @registry.register("/api/v1/cheese/<cheeseName>/smell")
+        def smell_cheese(cheeseName):
+            """Smells cheese."""
+            return "Pooh"
+
+        data = self._get(app, "/api/v1/spec.json?methods=GET")
+        self.assertEqual(len(self._operations(data["apis"][0])),
+                         len(self._operations(first["apis"][0])) + 1)
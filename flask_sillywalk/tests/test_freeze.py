@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+import hashlib
+import json
+import os
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import (SwaggerApiRegistry, SwaggerRegistryError,
+                                 ApiParameter)
+from flask.ext.sillywalk.encoding import stdlib_dumps
+
+
+URLS = ["/api/v1/resources.json", "/api/v1/spec.json",
+        "/api/v1/cheese.json", "/api/v1/holyHandGrenade.json"]
+
+
+class TestFreeze(unittest.TestCase):
+
+    def _create_app(self):
+        app = Flask("foobar")
+        self.encoded = []
+
+        def dumps(obj):
+            self.encoded.append(obj)
+            return stdlib_dumps(obj)
+
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1",
+                                      json_dumps=dumps)
+
+        @registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path")])
+        def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            return cheeseName
+
+        @registry.register("/api/v1/holyHandGrenade/<number>")
+        def get_a_holy_hand_grenade(number):
+            """Gets one or more holy hand grenades."""
+            return number
+
+        @registry.registerModel()
+        class Cheese(object):
+            def __init__(self, name, smelly=True):
+                pass
+
+        return app, registry
+
+    def _serve(self, app):
+        client = app.test_client()
+        digests = []
+        for url in URLS:
+            for encoding in ["identity", "gzip", "deflate"]:
+                ret = client.get(url, headers={"Accept-Encoding": encoding})
+                self.assertEqual(ret.status_code, 200)
+                digests.append(hashlib.sha1(ret.data).hexdigest())
+        return digests
+
+    def test_freeze(self):
+        app, registry = self._create_app()
+        registry.freeze()
+        self.assertTrue(registry.frozen)
+        encoded = len(self.encoded)
+        self._serve(app)
+        self.assertEqual(len(self.encoded), encoded)
+
+        generation = registry._generation
+        with self.assertRaises(SwaggerRegistryError):
+            registry.add_register("/api/v1/cheese", lambda: "")
+        with self.assertRaises(SwaggerRegistryError):
+            registry.add_register_many([])
+        with self.assertRaises(SwaggerRegistryError):
+            registry.registerModel()(object)
+        # still the compiled documents
+        self.assertEqual(registry._generation, generation)
+        self._serve(app)
+        self.assertEqual(len(self.encoded), encoded)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+    def test_forked_workers(self):
+        app, registry = self._create_app()
+        registry.freeze()
+        expected = self._serve(app)
+        encoded = len(self.encoded)
+
+        workers = []
+        for _ in range(4):
+            read, write = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    os.close(read)
+                    result = {
+                        "digests": self._serve(app),
+                        # served what was compiled before forking
+                        "encoded": len(self.encoded) - encoded}
+                    os.write(write, json.dumps(result).encode("utf-8"))
+                finally:
+                    os._exit(0)
+            os.close(write)
+            workers.append((pid, read))
+
+        for pid, read in workers:
+            with os.fdopen(read, "rb") as f:
+                result = json.loads(f.read().decode("utf-8"))
+            os.waitpid(pid, 0)
+            self.assertEqual(result["digests"], expected)
+            self.assertEqual(result["encoded"], 0)
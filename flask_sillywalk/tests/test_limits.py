@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+import asyncio
+import json
+import threading
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import (SwaggerApiRegistry, ApiParameter,
+                                 ApiErrorResponse)
+from flask.ext.sillywalk.compat import s
+from flask.ext.sillywalk.aio import wait_for_slot
+from flask.ext.sillywalk.limits import OVERLOADED, ConcurrencyLimit
+
+
+class TestLimits(unittest.TestCase):
+
+    def _create_app(self, queue_timeout=0, responseMessages=[]):
+        self.app = Flask("foobar")
+        self.registry = SwaggerApiRegistry(
+            self.app, baseurl="http://localhost/api/v1", metrics=True)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+        @self.registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path")],
+            responseMessages=responseMessages,
+            max_concurrency=1,
+            queue_timeout=queue_timeout)
+        def get_cheese(cheeseName):
+            """Gets cheese, slowly."""
+            self.started.set()
+            self.release.wait(5)
+            return cheeseName
+
+        @self.registry.register("/api/v1/parrot")
+        def get_parrot():
+            """Gets the parrot."""
+            return "Pining for the fjords"
+
+    def _busy(self):
+        """
+        Starts a request taking the only slot, returns the thread.
+        """
+        results = []
+        thread = threading.Thread(target=lambda: results.append(
+            self.app.test_client().get("/api/v1/cheese/brie").data))
+        thread.start()
+        self.started.wait(5)
+        return thread, results
+
+    def test_rejected(self):
+        self._create_app()
+        thread, results = self._busy()
+        client = self.app.test_client()
+        ret = client.get("/api/v1/cheese/stilton")
+        self.assertEqual(ret.status_code, 503)
+        self.assertEqual(json.loads(s(ret.data)),
+                         {"code": 503, "message": OVERLOADED})
+        # other operations aren't affected
+        self.assertEqual(client.get("/api/v1/parrot").status_code, 200)
+        self.release.set()
+        thread.join(5)
+        self.assertEqual(results, [b"brie"])
+        self.assertEqual(client.get("/api/v1/cheese/gouda").data, b"gouda")
+
+        data = json.loads(s(client.get("/api/v1/metrics.json").data))
+        cheese, parrot = data["operations"]
+        self.assertEqual(cheese["concurrency"], {
+            "maxConcurrency": 1, "queueTimeout": 0, "rejected": 1})
+        self.assertNotIn("concurrency", parrot)
+
+    def test_queue_timeout(self):
+        self._create_app(queue_timeout=5)
+        thread, results = self._busy()
+        threading.Timer(0.05, self.release.set).start()
+        ret = self.app.test_client().get("/api/v1/cheese/stilton")
+        self.assertEqual(ret.data, b"stilton")
+        thread.join(5)
+        limit = self.registry.operation_limits[
+            ("GET", "/cheese/{cheeseName}")][1]
+        self.assertEqual(limit.rejected, 0)
+
+    def test_documented(self):
+        self._create_app()
+        data = json.loads(s(self.app.test_client().get(
+            "/api/v1/cheese.json").data))
+        self.assertEqual(
+            data["apis"][0]["operations"][0]["responseMessages"],
+            [{"code": 503, "message": OVERLOADED}])
+
+    def test_declared_message(self):
+        self._create_app(responseMessages=[
+            ApiErrorResponse(503, "The cheese shop is closed")])
+        thread, results = self._busy()
+        ret = self.app.test_client().get("/api/v1/cheese/stilton")
+        self.assertEqual(json.loads(s(ret.data))["message"],
+                         "The cheese shop is closed")
+        self.release.set()
+        thread.join(5)
+
+    def test_async(self):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1")
+
+        @registry.register("/api/v1/parrot", max_concurrency=1)
+        async def get_parrot():
+            """Gets the parrot."""
+            await asyncio.sleep(0.01)
+            return "Pining for the fjords"
+
+        view = app.view_functions["get_parrot"]
+
+        async def both():
+            return await asyncio.gather(view(), view())
+
+        with app.test_request_context("/api/v1/parrot"):
+            first, second = asyncio.run(both())
+        self.assertEqual(first, "Pining for the fjords")
+        self.assertEqual(second.status_code, 503)
+
+    def test_async_cancelled_while_waiting(self):
+        limit = ConcurrencyLimit(1, queue_timeout=5)
+        limit.try_acquire()
+
+        async def cancel():
+            waiting = asyncio.ensure_future(wait_for_slot(limit))
+            await asyncio.sleep(0.1)
+            waiting.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiting
+            # the thread still waiting takes this slot, and gives it back
+            limit.release()
+
+        asyncio.run(cancel())
+        self.assertTrue(limit.try_acquire())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+import json
+import threading
+import unittest
+
+from flask import Flask, abort
+from flask.ext.sillywalk import SwaggerApiRegistry, ApiParameter
+from flask.ext.sillywalk.compat import s
+from flask.ext.sillywalk.metrics import LATENCY_BUCKETS, OperationMetrics
+
+
+class TestMetrics(unittest.TestCase):
+
+    def _create_app(self, metrics=True):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1",
+                                      metrics=metrics)
+
+        @registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path")],
+            nickname="getCheese")
+        def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            if cheeseName == "camembert":
+                return "It's runny", 503
+            return cheeseName
+
+        @registry.register("/api/v1/cheese", method="POST")
+        def add_cheese():
+            """Adds cheese."""
+            raise ValueError("This is a cheese shop")
+
+        return app, registry
+
+    def test_metrics(self):
+        app, registry = self._create_app()
+        client = app.test_client()
+        self.assertEqual(client.get("/api/v1/cheese/brie").data, b"brie")
+        client.get("/api/v1/cheese/cheddar")
+        client.get("/api/v1/cheese/camembert")
+        self.assertEqual(client.post("/api/v1/cheese").status_code, 500)
+
+        ret = client.get("/api/v1/metrics.json")
+        self.assertNotIn("Last-Modified", ret.headers)
+        self.assertNotIn("ETag", ret.headers)
+        data = json.loads(s(ret.data))
+        get, post = data["operations"]
+        self.assertEqual(
+            (get["httpMethod"], get["path"], get["resource"],
+             get["nickname"], get["calls"], get["errors"]),
+            ("GET", "/cheese/{cheeseName}", "cheese", "getCheese", 3, 1))
+        self.assertEqual((post["httpMethod"], post["calls"], post["errors"]),
+                         ("POST", 1, 1))
+        buckets = get["latency"]["buckets"]
+        self.assertEqual(len(buckets), len(LATENCY_BUCKETS) + 1)
+        self.assertEqual(buckets[-1], {"le": "+Inf", "count": 3})
+
+        # never a 304 with stale counters
+        client.get("/api/v1/cheese/brie")
+        ret = client.get("/api/v1/metrics.json", headers={
+            "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        self.assertEqual(ret.status_code, 200)
+        self.assertEqual(json.loads(s(ret.data))["operations"][0]["calls"], 4)
+
+    def test_http_exceptions(self):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1",
+                                      metrics=True)
+
+        @registry.register("/api/v1/parrot/<code>")
+        def get_parrot(code):
+            """Gets the parrot."""
+            abort(int(code))
+
+        client = app.test_client()
+        for code in [404, 410, 503]:
+            self.assertEqual(
+                client.get("/api/v1/parrot/{0}".format(code)).status_code,
+                code)
+        metrics = registry.operation_metrics[("GET", "/parrot/{code}")][1]
+        # like returning them, only the 5xx is an error
+        self.assertEqual((metrics.calls, metrics.errors), (3, 1))
+
+    def test_metrics_are_opt_in(self):
+        app, registry = self._create_app(metrics=False)
+        client = app.test_client()
+        self.assertEqual(client.get("/api/v1/cheese/brie").data, b"brie")
+        self.assertEqual(client.get("/api/v1/metrics.json").status_code, 404)
+        self.assertEqual(registry.operation_metrics, {})
+
+    def test_record_is_thread_safe(self):
+        metrics = OperationMetrics()
+
+        def record():
+            for i in range(1000):
+                metrics.record(0.003, error=i % 2 == 0)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        data = metrics.document()
+        self.assertEqual((data["calls"], data["errors"]), (8000, 4000))
+        self.assertEqual([b["count"] for b in data["latency"]["buckets"]][:4],
+                         [0, 0, 8000, 8000])
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import SwaggerApiRegistry
+
+
+class TestResolve(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask("foobar")
+        self.registry = SwaggerApiRegistry(
+            self.app, baseurl="http://localhost/api/v1")
+        for path, method, name in [
+                ("/api/v1/cheese/<cheeseName>", "GET", "get_cheese"),
+                ("/api/v1/cheese/<cheeseName>", "DELETE", "eat_cheese"),
+                ("/api/v1/cheese/stilton", "GET", "get_stilton"),
+                ("/api/v1/cheese/<int:shop>/<cheeseName>", "GET",
+                 "get_shop_cheese"),
+                ("/api/v1/cheese", "POST", "add_cheese"),
+                ("/api/v1/parrot/<path:remains>", "GET", "get_parrot")]:
+            def view(**kwargs):
+                return ""
+            view.__name__ = name
+            self.registry.add_register(path, view, method=method,
+                                       nickname=name)
+
+    def _resolve(self, method, path):
+        found = self.registry.resolve(method, path)
+        if found is None:
+            return None
+        api, params = found
+        return api.nickname, params
+
+    def test_resolve(self):
+        self.assertEqual(self._resolve("GET", "/api/v1/cheese/brie"),
+                         ("get_cheese", {"cheeseName": "brie"}))
+        self.assertEqual(self._resolve("delete", "/api/v1/cheese/brie"),
+                         ("eat_cheese", {"cheeseName": "brie"}))
+        self.assertEqual(self._resolve("POST", "/api/v1/cheese"),
+                         ("add_cheese", {}))
+        self.assertEqual(
+            self._resolve("GET", "/api/v1/cheese/3/brie"),
+            ("get_shop_cheese", {"shop": "3", "cheeseName": "brie"}))
+
+    def test_relative(self):
+        self.assertEqual(self._resolve("GET", "/cheese/brie"),
+                         ("get_cheese", {"cheeseName": "brie"}))
+
+    def test_static_first(self):
+        self.assertEqual(self._resolve("GET", "/api/v1/cheese/stilton"),
+                         ("get_stilton", {}))
+        # falls back to the parameter for other methods
+        self.assertEqual(self._resolve("DELETE", "/api/v1/cheese/stilton"),
+                         ("eat_cheese", {"cheeseName": "stilton"}))
+
+    def test_path_converter(self):
+        self.assertEqual(
+            self._resolve("GET", "/api/v1/parrot/pining/for/the/fjords"),
+            ("get_parrot", {"remains": "pining/for/the/fjords"}))
+
+    def test_converters(self):
+        @self.registry.register("/api/v1/cheese/<int:cheeseId>")
+        def get_cheese_by_id(cheeseId):
+            """Gets cheese by number."""
+            return ""
+
+        self.assertEqual(self._resolve("GET", "/api/v1/cheese/3")[1],
+                         {"cheeseId": "3"})
+        self.assertEqual(self._resolve("GET", "/api/v1/cheese/brie"),
+                         ("get_cheese", {"cheeseName": "brie"}))
+
+    def test_head(self):
+        self.assertEqual(self._resolve("HEAD", "/api/v1/cheese/brie"),
+                         ("get_cheese", {"cheeseName": "brie"}))
+
+    def test_not_found(self):
+        for method, path in [("PUT", "/api/v1/cheese/brie"),
+                             ("GET", "/api/v1/cheese"),
+                             ("GET", "/api/v1/cheese/1/2/3"),
+                             ("GET", "/api/v1/parrot"),
+                             ("GET", "/api/v1/spam")]:
+            self.assertIsNone(self._resolve(method, path))
+
+    def test_snapshot(self):
+        resolver = self.registry._resolver
+
+        @self.registry.register("/api/v1/cheese/<cheeseName>/smell")
+        def smell_cheese(cheeseName):
+            """Smells the cheese."""
+            return cheeseName
+
+        self.assertIsNone(resolver.resolve("GET", "/cheese/brie/smell"))
+        api, params = self.registry.resolve("GET", "/cheese/brie/smell")
+        self.assertEqual(api.summary, "Smells the cheese.")
+        # the untouched operations are still found in both
+        self.assertEqual(resolver.resolve("GET", "/cheese/brie")[0].nickname,
+                         "get_cheese")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+import json
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import SwaggerApiRegistry, SwaggerRegistryError
+from flask.ext.sillywalk.compat import s
+
+
+class TestSerializers(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask("foobar")
+        self.registry = SwaggerApiRegistry(
+            self.app, baseurl="http://localhost/api/v1", encode_views=True)
+
+        @self.registry.registerModel()
+        class Shop(object):
+            def __init__(self, name, owner: "Shopkeeper" = None):
+                self.name = name
+                self.owner = owner
+
+        @self.registry.registerModel()
+        class Shopkeeper(object):
+            def __init__(self, name, shop: "Shop" = None, boss: "Shopkeeper" = None):
+                self.name = name
+                self.shop = shop
+                self.boss = boss
+                self.till = "not a field"
+
+        @self.registry.registerModel()
+        class Cheese(object):
+            def __init__(self, name, smelly=True, *args, **kwargs):
+                self.name = name
+                self.smelly = smelly
+
+        self.Shop, self.Shopkeeper, self.Cheese = Shop, Shopkeeper, Cheese
+
+    def test_serialize(self):
+        serializer = self.registry.serializer(self.Cheese)
+        self.assertEqual(serializer.fields, ("name", "smelly"))
+        self.assertEqual(serializer(self.Cheese("brie", smelly=False)),
+                         {"name": "brie", "smelly": False})
+        self.assertIs(self.registry.serializer("Cheese"), serializer)
+
+    def test_serialize_many(self):
+        serializer = self.registry.serializer(self.Cheese)
+        cheeses = [self.Cheese(name) for name in ["brie", "stilton"]]
+        self.assertEqual(serializer.serialize_many(cheeses),
+                         [{"name": "brie", "smelly": True},
+                          {"name": "stilton", "smelly": True}])
+        self.assertEqual(serializer.serialize_many([]), [])
+
+    def test_nested(self):
+        boss = self.Shopkeeper("Mr Wensleydale")
+        shop = self.Shop("National Cheese Emporium")
+        shop.owner = self.Shopkeeper("Henry", shop=None, boss=boss)
+        self.assertEqual(self.registry.serializer(self.Shop)(shop), {
+            "name": "National Cheese Emporium",
+            "owner": {"name": "Henry", "shop": None, "boss": {
+                "name": "Mr Wensleydale", "shop": None, "boss": None}}})
+
+    def test_reregistered(self):
+        serializer = self.registry.serializer(self.Cheese)
+
+        @self.registry.registerModel()
+        class Cheese(object):
+            def __init__(self, name):
+                self.name = name
+
+        self.assertIsNot(self.registry.serializer(Cheese), serializer)
+        self.assertEqual(self.registry.serializer(Cheese)(Cheese("brie")),
+                         {"name": "brie"})
+
+    def test_unknown_model(self):
+        self.assertRaises(SwaggerRegistryError,
+                          self.registry.serializer, "Parrot")
+
+    def test_view(self):
+        cheeses = self.registry.serializer(self.Cheese)
+
+        @self.registry.register("/api/v1/cheese")
+        def get_cheeses():
+            """Lists the cheese."""
+            return cheeses.serialize_many([self.Cheese("brie")])
+
+        ret = self.app.test_client().get("/api/v1/cheese")
+        self.assertEqual(json.loads(s(ret.data)),
+                         [{"name": "brie", "smelly": True}])
+
+
+if __name__ == '__main__':
+    unittest.main()
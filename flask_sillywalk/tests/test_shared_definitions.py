@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+import json
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import (SwaggerApiRegistry, ApiParameter,
+                                 ApiErrorResponse)
+from flask.ext.sillywalk.compat import s
+
+
+class TestSharedDefinitions(unittest.TestCase):
+
+    def _create_app(self, stream=False):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1",
+                                      shared_definitions=True, stream=stream)
+        for name in ["brie", "stilton"]:
+            def get_cheese(shop):
+                return shop
+            get_cheese.__name__ = "get_{0}".format(name)
+            registry.add_register(
+                "/api/v1/cheese/{0}/<shop>".format(name),
+                get_cheese,
+                parameters=[ApiParameter("shop", "The shop", True, "str",
+                                         "path"),
+                            ApiParameter("page", "The page", False, "int",
+                                         "query")],
+                responseMessages=[ApiErrorResponse(404, "Out of cheese")],
+                nickname=name)
+        registry.add_register(
+            "/api/v1/parrot", lambda: "Pining for the fjords",
+            responseMessages=[ApiErrorResponse(404, "Deceased")])
+        return app, registry
+
+    def _get(self, app, url):
+        return json.loads(s(app.test_client().get(url).data))
+
+    def test_resource(self):
+        app, registry = self._create_app()
+        data = self._get(app, "/api/v1/cheese.json")
+        operations = [o for api in data["apis"] for o in api["operations"]]
+        self.assertEqual(len(operations), 2)
+        self.assertEqual(operations[0]["parameters"],
+                         operations[1]["parameters"])
+        self.assertEqual(operations[0]["responseMessages"],
+                         operations[1]["responseMessages"])
+        # each distinct definition once, operations refer to it
+        self.assertEqual(len(data["parameters"]), 2)
+        self.assertEqual(list(data["responses"].values()),
+                         [{"code": 404, "message": "Out of cheese"}])
+        for operation in operations:
+            for section, key in [("parameters", "parameters"),
+                                 ("responses", "responseMessages")]:
+                for ref in operation[key]:
+                    prefix = "#/{0}/".format(section)
+                    self.assertTrue(ref["$ref"].startswith(prefix))
+                    self.assertIn(ref["$ref"][len(prefix):], data[section])
+        self.assertEqual(
+            [data["parameters"][ref["$ref"].split("/")[-1]]["name"]
+             for ref in operations[0]["parameters"]],
+            ["shop", "page"])
+
+    def test_content_hash(self):
+        app, registry = self._create_app()
+        data = self._get(app, "/api/v1/spec.json")
+        # same code, different messages
+        self.assertEqual(len(data["responses"]), 2)
+        self.assertTrue(all(ref.startswith("404-")
+                            for ref in data["responses"]))
+        # the same definition gets the same name in every document
+        resource = self._get(app, "/api/v1/cheese.json")
+        for ref, definition in resource["responses"].items():
+            self.assertEqual(data["responses"][ref], definition)
+
+    def test_streamed(self):
+        app, registry = self._create_app()
+        expected = [self._get(app, url) for url in ["/api/v1/cheese.json",
+                                                    "/api/v1/spec.json"]]
+        app, registry = self._create_app(stream=True)
+        streamed = [self._get(app, url) for url in ["/api/v1/cheese.json",
+                                                    "/api/v1/spec.json"]]
+        self.assertEqual(streamed, expected)
+
+    def test_inlined_by_default(self):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1")
+        registry.add_register(
+            "/api/v1/parrot", lambda: "Pining for the fjords",
+            responseMessages=[ApiErrorResponse(404, "Deceased")])
+        data = self._get(app, "/api/v1/parrot.json")
+        self.assertNotIn("responses", data)
+        self.assertEqual(
+            data["apis"][0]["operations"][0]["responseMessages"],
+            [{"code": 404, "message": "Deceased"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
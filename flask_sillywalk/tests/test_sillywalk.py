@@ -1,7 +1,12 @@
 #!/usr/bin/env python
+import datetime
+import gzip
+import io
 import os
 import json
+import typing
 import unittest
+import zlib
 
 from flask import Flask, make_response, request, Blueprint
 from flask.ext.sillywalk import SwaggerApiRegistry, ApiParameter, ApiErrorResponse
@@ -31,6 +36,12 @@ class TestDecorators(unittest.TestCase):
 
         return app, registry
 
+    def _peek(self, app, url, headers=None):
+        # calls the view without dispatching, so the app still takes routes
+        with app.test_request_context(url, headers=headers):
+            view = app.view_functions[request.url_rule.endpoint]
+            return app.make_response(view(**request.view_args))
+
     def _create_blueprint(self, app):
         bp = Blueprint("blueish", "bluishns")
         app.register_blueprint(bp)
@@ -159,6 +170,45 @@ class TestDecorators(unittest.TestCase):
             'required': ['name', 'age'], 'type': 'object',
             'properties': {'birthday': {'default': 'tomorrow'}}}})
 
+    def test_model_is_introspected_lazily(self):
+        app, registry = self._create_app()
+        self._create_model(registry.registerModel)
+        self.assertEqual(dict(registry.models), {})
+        app.test_client().get("/api/v1/resources.json")
+        self.assertEqual(list(registry.models), ["SomeCrazyClass"])
+
+    def test_model_signature(self):
+        app, registry = self._create_app()
+
+        @registry.registerModel()
+        class Coconut(object):
+            pass
+
+        @registry.registerModel()
+        class Knight(object):
+            """A knight who says Ni."""
+
+            def __init__(self, name: str, *args, shrubberies: int,
+                         horse=None, coconut: Coconut = None,
+                         squire: "Squire" = None,
+                         knighted: datetime.date = None,
+                         title: typing.Optional[str] = None, **kwargs):
+                pass
+
+        ret = app.test_client().get("/api/v1/resources.json")
+        data = json.loads(s(ret.data))
+        self.assertEqual(data['models']['Knight'], {
+            'description': 'A knight who says Ni.',
+            'id': 'Knight',
+            'required': ['name', 'shrubberies'], 'type': 'object',
+            'properties': {'name': {'type': 'string'},
+                           'shrubberies': {'type': 'integer'},
+                           'horse': {'default': None},
+                           'coconut': {'$ref': 'Coconut', 'default': None},
+                           'squire': {'$ref': 'Squire', 'default': None},
+                           'knighted': {'default': None},
+                           'title': {'default': None}}})
+
     def test_register(self):
         app, registry = self._create_app()
         self._create_register(registry.register, app)
@@ -177,14 +227,18 @@ class TestDecorators(unittest.TestCase):
         self.assertEqual([x.endpoint for x in app.url_map.iter_rules()],
                          ['holyHandGrenade',
                           'resources',
+                          'changes',
                           'cheese',
+                          'spec',
                           'get_a_holy_hand_grenade',
                           'toss_the_grenade',
                           'get_cheese',
                           'static'])
         self.assertEqual([x.rule for x in app.url_map.iter_rules()],
                          ['/api/v1/holyHandGrenade.json',
-                          '/api/v1/resources.json', '/api/v1/cheese.json',
+                          '/api/v1/resources.json',
+                          '/api/v1/changes.json', '/api/v1/cheese.json',
+                          '/api/v1/spec.json',
                           '/api/v1/holyHandGrenade/<number>',
                           '/api/v1/holyHandGrenade/<number>',
                           '/api/v1/cheese/<cheeseName>',
@@ -226,7 +280,9 @@ class TestDecorators(unittest.TestCase):
         self.assertEqual([x.endpoint for x in app.url_map.iter_rules()],
                          ['holyHandGrenade',
                           'resources',
+                          'changes',
                           'cheese',
+                          'spec',
                           'blueish.get_a_holy_hand_grenade',
                           'blueish.toss_the_grenade',
                           'blueish.get_cheese',
@@ -250,6 +306,180 @@ class TestDecorators(unittest.TestCase):
         self.assertEqual(data["resourcePath"], "cheese")
         self.assertEqual([x.endpoint for x in app.url_map.iter_rules()],
                          ['resources',
+                          'changes',
                           'cheese',
+                          'spec',
                           'blueish.get_cheese',
                           'static'])
+
+    def test_document_cache(self):
+        app, registry = self._create_app()
+        self._create_add_register(registry.add_register, app)
+        first = self._peek(app, "/api/v1/cheese.json").data
+        # served from the cache until the next registration
+        registry.r["cheese"]["/cheese/{cheeseName}"][0].notes = "stale"
+        self.assertEqual(self._peek(app, "/api/v1/cheese.json").data, first)
+
+        def get_brie():
+            """Gets brie."""
+            return "brie"
+
+        registry.add_register("/api/v1/cheese/brie", get_brie)
+        data = json.loads(s(app.test_client().get("/api/v1/cheese.json").data))
+        self.assertEqual(sorted(x["path"] for x in data["apis"]),
+                         ["/cheese/brie", "/cheese/{cheeseName}"])
+        self.assertEqual(data["apis"][0]["operations"][0]["notes"], "stale")
+
+    def test_conditional_get(self):
+        app, registry = self._create_app()
+        self._create_add_register(registry.add_register, app)
+        ret = self._peek(app, "/api/v1/cheese.json")
+        etag = ret.headers["ETag"]
+        last_modified = ret.headers["Last-Modified"]
+        self.assertEqual(ret.status_code, 200)
+
+        ret = self._peek(app, "/api/v1/cheese.json",
+                         headers={"If-None-Match": etag})
+        self.assertEqual(ret.status_code, 304)
+        self.assertEqual(ret.data, b"")
+        self.assertEqual(ret.headers["ETag"], etag)
+        ret = self._peek(app, "/api/v1/resources.json",
+                         headers={"If-Modified-Since": last_modified})
+        self.assertEqual(ret.status_code, 304)
+
+        def get_brie():
+            """Gets brie."""
+            return "brie"
+
+        registry.add_register("/api/v1/cheese/brie", get_brie)
+        ret = app.test_client().get("/api/v1/cheese.json",
+                         headers={"If-None-Match": etag})
+        self.assertEqual(ret.status_code, 200)
+        self.assertNotEqual(ret.headers["ETag"], etag)
+        # registered within the same second as the copy the client holds
+        ret = self._peek(app, "/api/v1/resources.json",
+                         headers={"If-Modified-Since": last_modified})
+        self.assertEqual(ret.status_code, 200)
+
+    def test_compressed_documents(self):
+        app, registry = self._create_app()
+        self._create_add_register(registry.add_register, app)
+        client = app.test_client()
+        plain = client.get("/api/v1/cheese.json")
+        self.assertEqual(plain.headers.get("Content-Encoding"), None)
+        self.assertEqual(plain.headers["Vary"], "Accept-Encoding")
+
+        ret = client.get("/api/v1/cheese.json",
+                         headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(ret.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(ret.data)).read(),
+                         plain.data)
+        self.assertNotEqual(ret.headers["ETag"], plain.headers["ETag"])
+        etag = ret.headers["ETag"]
+
+        ret = client.get("/api/v1/cheese.json",
+                         headers={"Accept-Encoding": "deflate"})
+        self.assertEqual(ret.headers["Content-Encoding"], "deflate")
+        self.assertEqual(zlib.decompress(ret.data), plain.data)
+
+        ret = client.get("/api/v1/cheese.json",
+                         headers={"Accept-Encoding": "gzip",
+                                  "If-None-Match": etag})
+        self.assertEqual(ret.status_code, 304)
+
+    def test_add_register_many(self):
+        app, registry = self._create_app()
+
+        def get_cheese(cheeseName):
+            """Gets cheese, just like the name says."""
+            return cheeseName
+
+        def add_cheese():
+            """Adds cheese."""
+            return "OK"
+
+        def get_a_holy_hand_grenade(number):
+            """Gets one or more holy hand grenades."""
+            return number
+
+        registry.add_register_many([
+            {"path": "/api/v1/cheese/<cheeseName>", "f": get_cheese},
+            {"path": "/cheese", "f": add_cheese, "method": "POST",
+             "notes": "Adds cheese."},
+            {"path": "/api/v1/holyHandGrenade/<number>",
+             "f": get_a_holy_hand_grenade}])
+        self.assertEqual(registry.registered_routes,
+                         set(["/api/v1/cheese.json",
+                              "/api/v1/holyHandGrenade.json"]))
+        data = json.loads(s(app.test_client().get("/api/v1/cheese.json").data))
+        self.assertEqual(sorted(x["path"] for x in data["apis"]),
+                         ["/cheese", "/cheese/{cheeseName}"])
+        ret = app.test_client().post("/api/v1/cheese")
+        self.assertEqual(ret.data, b"OK")
+
+    def test_definitions_are_interned(self):
+        app, registry = self._create_app()
+        self._create_register(registry.register, app)
+
+        @registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            method="DELETE",
+            parameters=[
+                ApiParameter(
+                    name="cheeseName",
+                    description="The name of the cheese to fetch",
+                    required=True,
+                    dataType="str",
+                    paramType="path",
+                    allowMultiple=False)],
+            responseMessages=[
+                ApiErrorResponse(400, "Sorry, we're fresh out of that cheese."),
+                ApiErrorResponse(418, "I'm actually a teapot")
+            ])
+        def delete_cheese(cheeseName):
+            """Deletes cheese."""
+            return ""
+
+        get, post = registry.r["holyHandGrenade"]["/holyHandGrenade/{number}"]
+        cheese = registry.r["cheese"]["/cheese/{cheeseName}"]
+        self.assertEqual(len(cheese), 2)
+        self.assertIs(cheese[0].parameters[0], cheese[1].parameters[0])
+        self.assertIs(cheese[0].responseMessages[1],
+                      cheese[1].responseMessages[1])
+        # same name, different description
+        self.assertIsNot(get.parameters[0], post.parameters[0])
+        # equal, but documented differently
+        required = [registry._intern(ApiParameter("n", "", value, "int",
+                                                  "query"))
+                    for value in (True, 1, 1.0)]
+        self.assertEqual([type(x.document()["required"]) for x in required],
+                         [bool, int, float])
+        self.assertFalse(hasattr(get, "__dict__"))
+        self.assertFalse(hasattr(get.parameters[0], "__dict__"))
+        self.assertEqual(post.parameters[1].document(), {
+            "name": "target",
+            "description": "At whom should I thrown the hand grenade?",
+            "required": False,
+            "dataType": "str",
+            "paramType": "query",
+            "allowMultiple": False})
+
+    def test_spec(self):
+        app, registry = self._create_app()
+        self._create_register(registry.register, app)
+        self._create_model(registry.registerModel)
+        client = app.test_client()
+        data = json.loads(s(client.get("/api/v1/spec.json").data))
+        self.assertEqual(data['swaggerVersion'], '1.3')
+        self.assertEqual(list(data['models']), ['SomeCrazyClass'])
+        for resource in data['apis']:
+            ret = client.get("/api/v1/{0}.json".format(
+                resource["resourcePath"]))
+            self.assertEqual(resource["apis"],
+                             json.loads(s(ret.data))["apis"])
+        self.assertEqual(sorted(x["path"] for x in data['apis']),
+                         ['/cheese.{format}', '/holyHandGrenade.{format}'])
+        etag = client.get("/api/v1/spec.json").headers["ETag"]
+        self.assertEqual(client.get("/api/v1/spec.json",
+                                    headers={"If-None-Match": etag}).status_code,
+                         304)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+import tracemalloc
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import SwaggerApiRegistry, ApiParameter
+from flask.ext.sillywalk.encoding import backends
+
+
+class TestStreaming(unittest.TestCase):
+
+    def _create_registry(self, operations, stream=True, json_dumps=None):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1",
+                                      stream=stream, json_dumps=json_dumps)
+        endpoints = []
+        for i in range(operations):
+            def view(id):
+                """Gets some cheese."""
+                return id
+            view.__name__ = "view_{0}".format(i)
+            endpoints.append({
+                "path": "/api/v1/cheese/{0}/<id>".format(i),
+                "f": view,
+                "parameters": [ApiParameter(
+                    "id", "The id of the cheese " * 10, True, "int", "path")]})
+        registry.add_register_many(endpoints)
+        return app, registry
+
+    def _peak(self, registry):
+        # the first pass materializes instance dicts for good, skip it
+        for chunk in registry.stream_resource("cheese"):
+            pass
+        tracemalloc.start()
+        try:
+            for chunk in registry.stream_resource("cheese"):
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_streamed_documents_match(self):
+        for name, dumps in backends():
+            app, registry = self._create_registry(20, json_dumps=dumps)
+
+            @registry.registerModel()
+            class Cheese(object):
+                def __init__(self, name, smelly=True):
+                    pass
+
+            # the very bytes the cached documents are made of
+            client = app.test_client()
+            self.assertEqual(client.get("/api/v1/cheese.json").data,
+                             dumps(registry.show_resource("cheese")()), name)
+            self.assertEqual(client.get("/api/v1/resources.json").data,
+                             dumps(registry.resources()), name)
+
+    def test_peak_memory_is_flat(self):
+        small = self._peak(self._create_registry(100)[1])
+        large = self._peak(self._create_registry(1000)[1])
+        self.assertLess(large, small * 2)
+
+    def test_streamed_spec_matches(self):
+        for name, dumps in backends():
+            app, registry = self._create_registry(20, json_dumps=dumps)
+            self.assertEqual(app.test_client().get("/api/v1/spec.json").data,
+                             dumps(registry.spec()), name)
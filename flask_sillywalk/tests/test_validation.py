@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+import asyncio
+import inspect
+import json
+import unittest
+
+from flask import Flask
+from flask.ext.sillywalk import (SwaggerApiRegistry, ApiParameter,
+                                 ApiErrorResponse)
+from flask.ext.sillywalk.compat import s
+from flask.ext.sillywalk.sillywalk import ImplicitApiParameter
+
+
+class TestValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask("foobar")
+        self.registry = SwaggerApiRegistry(
+            self.app, baseurl="http://localhost/api/v1",
+            validate_requests=True)
+        self.client = self.app.test_client()
+
+        @self.registry.register(
+            "/api/v1/holyHandGrenade/<number>",
+            method="POST",
+            parameters=[
+                ApiParameter("number", "Seconds to wait", True, "int",
+                             "path"),
+                ApiParameter("target", "Whom to throw it at", False, "str",
+                             "query"),
+                ApiParameter("blessed", "Blessed by St Attila", False,
+                             "boolean", "query"),
+                ApiParameter("counts", "What to count to", False, "int",
+                             "query", allowMultiple=True),
+                ApiParameter("X-Brother", "Who reads the book", True, "str",
+                             "header")],
+            responseMessages=[
+                ApiErrorResponse(400, "Three shall be the number thou "
+                                      "shalt count")])
+        def toss_the_grenade(number, target="FOO", blessed=False,
+                             counts=()):
+            """Toss the holy hand grenade after {number} seconds."""
+            return json.dumps([number, target, blessed, list(counts)])
+
+    def _post(self, url, headers={"X-Brother": "Maynard"}):
+        ret = self.client.post(url, headers=headers)
+        return ret.status_code, json.loads(s(ret.data))
+
+    def test_coerced(self):
+        self.assertEqual(
+            self._post("/api/v1/holyHandGrenade/3?target=rabbit&blessed=true"
+                       "&counts=1&counts=2&counts=3"),
+            (200, [3, "rabbit", True, [1, 2, 3]]))
+
+    def test_defaults(self):
+        self.assertEqual(self._post("/api/v1/holyHandGrenade/3"),
+                         (200, [3, "FOO", False, []]))
+
+    def test_bad_request(self):
+        status, data = self._post(
+            "/api/v1/holyHandGrenade/five?blessed=maybe&counts=1&counts=x",
+            headers={})
+        self.assertEqual(status, 400)
+        self.assertEqual(data["code"], 400)
+        self.assertEqual(data["message"],
+                         "Three shall be the number thou shalt count")
+        self.assertEqual(data["errors"], [
+            {"name": "number", "paramType": "path",
+             "error": "not a valid int"},
+            {"name": "blessed", "paramType": "query",
+             "error": "not a valid boolean"},
+            {"name": "counts", "paramType": "query",
+             "error": "not a valid int"},
+            {"name": "X-Brother", "paramType": "header",
+             "error": "missing"}])
+
+    def test_strict_numbers(self):
+        @self.registry.register(
+            "/api/v1/cheese/<int:age>",
+            parameters=[ApiParameter("age", "Age in months", True, "int",
+                                     "path"),
+                        ApiParameter("weight", "Weight in kg", False,
+                                     "double", "query")])
+        def get_cheese(age, weight=None):
+            """Gets cheese of a given age."""
+            return json.dumps([age, weight])
+
+        ret = self.client.get("/api/v1/cheese/12?weight=-1.5e2")
+        self.assertEqual(json.loads(s(ret.data)), [12, -150.0])
+        ret = self.client.get("/api/v1/cheese/12?weight=.5")
+        self.assertEqual(json.loads(s(ret.data)), [12, 0.5])
+        for weight in [" 5 ", "1_000", "nan", "inf", "-Infinity", "1e999",
+                       "0x10", "5\n", ""]:
+            ret = self.client.get("/api/v1/cheese/12",
+                                  query_string={"weight": weight})
+            self.assertEqual(ret.status_code, 400, weight)
+        for number in [" 5 ", "1_000", "+", "5.0", "\u0665"]:
+            ret = self.client.post(
+                "/api/v1/holyHandGrenade/3",
+                query_string={"counts": number},
+                headers={"X-Brother": "Maynard"})
+            self.assertEqual(ret.status_code, 400, number)
+
+    def test_default_value(self):
+        @self.registry.register(
+            "/api/v1/cheese",
+            parameters=[ImplicitApiParameter(
+                "limit", "How many", False, "int", "query",
+                default_value=10)])
+        def get_cheeses(**kwargs):
+            """Lists the cheese."""
+            return json.dumps(kwargs)
+
+        ret = self.client.get("/api/v1/cheese")
+        self.assertEqual(json.loads(s(ret.data)), {"limit": 10})
+        ret = self.client.get("/api/v1/cheese?limit=2")
+        self.assertEqual(json.loads(s(ret.data)), {"limit": 2})
+        ret = self.client.get("/api/v1/cheese?limit=lots")
+        self.assertEqual(ret.status_code, 400)
+        self.assertEqual(json.loads(s(ret.data))["message"], "Bad Request")
+
+    def test_async(self):
+        @self.registry.register(
+            "/api/v1/cheese/<cheeseName>",
+            parameters=[ApiParameter("cheeseName", "The cheese", True,
+                                     "str", "path"),
+                        ApiParameter("age", "Age in months", False, "int",
+                                     "query")])
+        async def get_cheese(cheeseName, age=None):
+            """Gets cheese, just like the name says."""
+            return "{0} {1!r}".format(cheeseName, age)
+
+        view = self.app.view_functions["get_cheese"]
+        self.assertTrue(inspect.iscoroutinefunction(view))
+        with self.app.test_request_context("/api/v1/cheese/brie?age=12"):
+            self.assertEqual(asyncio.run(view(cheeseName="brie")),
+                             "brie 12")
+        with self.app.test_request_context("/api/v1/cheese/brie?age=old"):
+            self.assertEqual(asyncio.run(view(cheeseName="brie")).status_code,
+                             400)
+
+    def test_opt_in(self):
+        app = Flask("foobar")
+        registry = SwaggerApiRegistry(app, baseurl="http://localhost/api/v1")
+
+        @registry.register(
+            "/api/v1/holyHandGrenade/<number>",
+            parameters=[ApiParameter("number", "How many", True, "int",
+                                     "path")])
+        def get_a_holy_hand_grenade(number):
+            """Gets one or more holy hand grenades."""
+            return repr(number)
+
+        ret = app.test_client().get("/api/v1/holyHandGrenade/5")
+        self.assertEqual(ret.data, b"'5'")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Request validation compiled from the declared parameters of an operation.
+Each operation gets a function checking its path, query and header
+parameters and coercing them to their declared types, generated once when
+it is registered.
+"""
+import functools
+import inspect
+import math
+import re
+
+import flask
+
+
+class ValidationError(Exception):
+    """
+    A request didn't match the declared parameters. ``errors`` holds a dict
+    per offending parameter.
+    """
+
+    def __init__(self, errors):
+        super(ValidationError, self).__init__(errors)
+        self.errors = errors
+
+
+# plain decimal notation only: no spaces, underscores, nan or infinity
+_INTEGER = re.compile(r"[-+]?[0-9]+\Z")
+_NUMBER = re.compile(r"[-+]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][-+]?[0-9]+)?\Z")
+
+
+def _integer(value):
+    if isinstance(value, int):
+        # converted by the route already, e.g. <int:number>
+        return value
+    if not _INTEGER.match(value):
+        raise ValueError(value)
+    return int(value)
+
+
+def _number(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not _NUMBER.match(value):
+        raise ValueError(value)
+    number = float(value)
+    if math.isinf(number):
+        # e.g. 1e999
+        raise ValueError(value)
+    return number
+
+
+def _boolean(value):
+    lowered = value.lower()
+    if lowered in ("true", "1"):
+        return True
+    if lowered in ("false", "0"):
+        return False
+    raise ValueError(value)
+
+
+# dataType -> function converting the string sent, strings are left alone
+COERCERS = {
+    "int": _integer,
+    "integer": _integer,
+    "long": _integer,
+    "float": _number,
+    "double": _number,
+    "number": _number,
+    "bool": _boolean,
+    "boolean": _boolean}
+
+VALIDATED = ("path", "query", "header")
+
+
+def _error(errors, param, error):
+    if errors is None:
+        errors = []
+    errors.append({"name": param.name, "paramType": param.paramType,
+                   "error": error})
+    return errors
+
+
+def compile_validator(parameters, accepts=None):
+    """
+    Generates ``validate(kwargs, request)``, which checks the path
+    parameters in ``kwargs`` and the query and header parameters of
+    ``request`` against ``parameters``. It returns ``kwargs`` with the
+    coerced values, including the query and header parameters a view
+    ``accepts`` (a set of names, None for all), or raises ValidationError.
+    Missing optional parameters get their defaultValue, if they have one.
+    """
+    namespace = {"ValidationError": ValidationError, "_error": _error}
+    lines = ["def validate(kwargs, request):", "    errors = None"]
+    params = [p for p in parameters if p.paramType in VALIDATED]
+    if any(p.paramType == "query" for p in params):
+        lines.append("    args = request.args")
+    if any(p.paramType == "header" for p in params):
+        lines.append("    headers = request.headers")
+    for i, param in enumerate(params):
+        namespace["_p{0}".format(i)] = param
+        name = repr(param.name)
+        multiple = param.allowMultiple and param.paramType == "query"
+        if param.paramType == "path":
+            lines.append("    value = kwargs.get({0})".format(name))
+        elif multiple:
+            lines.append("    value = args.getlist({0}) or None".format(name))
+        elif param.paramType == "query":
+            lines.append("    value = args.get({0})".format(name))
+        else:
+            lines.append("    value = headers.get({0})".format(name))
+        passed = (param.paramType == "path" or accepts is None or
+                  param.name in accepts)
+        target = ("kwargs[{0}] = ".format(name) if passed else "")
+        lines.append("    if value is None:")
+        if param.required:
+            lines.append(
+                "        errors = _error(errors, _p{0}, 'missing')".format(i))
+        elif passed and hasattr(param, "defaultValue"):
+            namespace["_d{0}".format(i)] = param.defaultValue
+            lines.append("        {0}_d{1}".format(target, i))
+        else:
+            lines.append("        pass")
+        coerce = COERCERS.get(param.dataType)
+        if coerce is None:
+            if passed and param.paramType != "path":
+                lines.append("    else:")
+                lines.append("        {0}value".format(target))
+            continue
+        namespace["_c{0}".format(i)] = coerce
+        converted = ("[_c{0}(v) for v in value]" if multiple
+                     else "_c{0}(value)").format(i)
+        lines.extend([
+            "    else:",
+            "        try:",
+            "            {0}{1}".format(target, converted),
+            "        except (TypeError, ValueError):",
+            "            errors = _error(errors, _p{0}, {1})".format(
+                i, repr("not a valid {0}".format(param.dataType)))])
+    lines.extend([
+        "    if errors:",
+        "        raise ValidationError(errors)",
+        "    return kwargs"])
+    exec(compile("\n".join(lines) + "\n", "<validator>", "exec"), namespace)
+    return namespace["validate"]
+
+
+def accepted(f):
+    """
+    Returns the names of the keyword arguments ``f`` takes, or None if it
+    takes any.
+    """
+    names = set()
+    for param in inspect.signature(f).parameters.values():
+        if param.kind == param.VAR_KEYWORD:
+            return None
+        if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
+            names.add(param.name)
+    return names
+
+
+def bad_request(errors, responseMessages, dumps):
+    """
+    Returns the 400 response for ``errors``, with the message of the
+    declared 400 response message if there is one.
+    """
+    message = "Bad Request"
+    for response in responseMessages:
+        if response.code == 400:
+            message = response.message
+            break
+    return flask.Response(
+        response=dumps({"code": 400, "message": message, "errors": errors}),
+        status=400,
+        mimetype="application/json")
+
+
+def validate_view(f, parameters, responseMessages, dumps):
+    """
+    Wraps the view ``f`` so it's only called with valid requests, and with
+    its parameters coerced to their declared types. Others get a 400.
+    """
+    validate = compile_validator(parameters, accepted(f))
+
+    @functools.wraps(f)
+    def inner_func(*args, **kwargs):
+        try:
+            kwargs = validate(kwargs, flask.request)
+        except ValidationError as e:
+            return bad_request(e.errors, responseMessages, dumps)
+        return f(*args, **kwargs)
+
+    return inner_func
@@ -19,7 +19,7 @@ setup(
     author_email='rob.walsh@gmail.com',
     description='So you want to implement an auto-documenting API?',
     long_description=description,
-    packages=find_packages(exclude=['ez_setup', 'examples']),
+    packages=find_packages(exclude=['ez_setup', 'examples', 'benchmarks']),
     zip_safe=False,
     include_package_data=True,
     platforms='any',
@@ -28,6 +28,10 @@ setup(
         'pytest-cov',
         'coverage',
     ],
+    extras_require={
+        'fast': ['orjson'],
+        'async': ['flask[async]'],
+    },
     classifiers=[
         'Environment :: Web Environment',
         'Intended Audience :: Developers',